@@ -1,12 +1,20 @@
 # FlexPower Task 1: Asset and Portfolio Forecasting
 
 import sys
-sys.path.append('../DataEngineeringChallenge/DataEngineeringChallenge/src/')
-
 import os
+# Project root, for the helpers shared between tasks and the VPP client
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(PROJECT_ROOT, 'DataEngineeringChallenge/DataEngineeringChallenge/src/'))
+sys.path.append(PROJECT_ROOT)
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 import pendulum
-import json
+import orjson
+from json_records import iter_record_keys
 # Import the actual VPP client
 from vpp.client import get_forecast as vpp_get_forecast
 
@@ -28,25 +36,21 @@ def extract_asset_ids(path):
         print(f"ERROR Path does not exist: {path}")
         return []
 
-    for filename in os.listdir(path):
-        if filename.endswith('.json'):
-            filepath = os.path.join(path, filename)
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not (entry.name.endswith('.json') and entry.is_file()):
+                continue
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                    # Handle both list and single dict formats
-                    records = data if isinstance(data, list) else [data]
-
-                    for entry in records:
-                        asset_id = entry.get("key", {}).get("asset_id")
+                with open(entry.path, 'rb') as f:
+                    for key in iter_record_keys(f):
+                        asset_id = key.get("asset_id")
                         if not asset_id: 
-                            asset_id = entry.get("key", {}).get("entity_id")
+                            asset_id = key.get("entity_id")
                         if asset_id:
                             asset_ids.add(asset_id)
 
             except Exception as e:
-                print(f"ERROR Failed to read {filename}: {e}")
+                print(f"ERROR Failed to read {entry.name}: {e}")
     asset_ids = sorted(asset_ids)
     return asset_ids
 
@@ -76,26 +80,20 @@ def create_forecast_dataframes(all_forecasts):
     if not all_forecasts:
         return pd.DataFrame(), pd.DataFrame()
     
-    all_records = []
+    frames = []
     for forecast_json in all_forecasts:
         # Parse the JSON string
-        forecast = json.loads(forecast_json)
-        
-        # Extract data
-        asset_id = forecast['key']['asset_id']
-        starts = pd.to_datetime(forecast['values'][0], unit='s')
-        power_values = forecast['values'][3]
+        forecast = orjson.loads(forecast_json)
         
-        # Create records
-        for start, power in zip(starts, power_values):
-            all_records.append({
-                'delivery_start': start,
-                'asset_id': asset_id,
-                'value_kw': power
-            })
+        # Build one small frame per forecast straight from its value arrays
+        frames.append(pd.DataFrame({
+            'delivery_start': pd.to_datetime(forecast['values'][0], unit='s'),
+            'asset_id': forecast['key']['asset_id'],
+            'value_kw': np.asarray(forecast['values'][3], dtype=np.float64)
+        }))
     
     # Create DataFrame
-    df_asset = pd.DataFrame(all_records)
+    df_asset = pd.concat(frames, ignore_index=True)
 
     # Portfolio-level forecasts (sum all assets by delivery time)
     df_portfolio = df_asset.groupby('delivery_start')['value_kw'].sum().reset_index()
@@ -106,21 +104,38 @@ def create_forecast_dataframes(all_forecasts):
 
     return df_asset, df_portfolio
 
+def _write_csv(df, path):
+    """Write a frame with pyarrow's CSV writer, timestamps as 'YYYY-MM-DD HH:MM:SS'"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            # Truncated to whole seconds, as to_csv's date_format would, so %S is
+            # not written with a fractional part
+            seconds = table.column(i).cast(pa.timestamp('s', field.type.tz), safe=False)
+            table = table.set_column(i, field.name, pc.strftime(seconds, format='%Y-%m-%d %H:%M:%S'))
+    # Strings (and the header) are quoted, so commas, quotes or newlines in them
+    # cannot break a row apart
+    pa_csv.write_csv(table, path, pa_csv.WriteOptions(quoting_style='needed'))
+
 def save_forecasts(df_asset, df_portfolio):
     os.makedirs("output", exist_ok=True)
-    df_asset.to_csv("output/asset_forecasts.csv", index=False)
-    df_portfolio.to_csv("output/portfolio_forecast.csv", index=False)
-
-
-asset_dir = '../DataEngineeringChallenge/DataEngineeringChallenge/src/vpp/live_measured_infeed'
-
-asset_ids = extract_asset_ids(asset_dir)
-# print(asset_ids)
-intervals = generate_intervals("2025-07-08")
-# print(intervals)
-forecasts = fetch_latest_forecasts(asset_ids, intervals)
-# print(forecasts)
-df_asset, df_portfolio = create_forecast_dataframes(forecasts)
-# print(df_asset)
-# print(df_portfolio)
-save_forecasts(df_asset, df_portfolio)
+    _write_csv(df_asset, "output/asset_forecasts.csv")
+    _write_csv(df_portfolio, "output/portfolio_forecast.csv")
+
+
+def main():
+    asset_dir = '../DataEngineeringChallenge/DataEngineeringChallenge/src/vpp/live_measured_infeed'
+
+    asset_ids = extract_asset_ids(asset_dir)
+    # print(asset_ids)
+    intervals = generate_intervals("2025-07-08")
+    # print(intervals)
+    forecasts = fetch_latest_forecasts(asset_ids, intervals)
+    # print(forecasts)
+    df_asset, df_portfolio = create_forecast_dataframes(forecasts)
+    # print(df_asset)
+    # print(df_portfolio)
+    save_forecasts(df_asset, df_portfolio)
+
+if __name__ == "__main__":
+    main()
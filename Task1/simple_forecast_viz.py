@@ -1,14 +1,26 @@
+import os
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 
 st.set_page_config(page_title="FlexPower Task 1 - Forecasting", layout="wide")
 
-def load_data():
+ASSET_CSV = "output/asset_forecasts.csv"
+PORTFOLIO_CSV = "output/portfolio_forecast.csv"
+
+def _file_mtimes():
+    # Modification times of the forecast CSVs; used as cache keys so a rerun of
+    # the forecasting script invalidates the cached frames
+    try:
+        return os.path.getmtime(ASSET_CSV), os.path.getmtime(PORTFOLIO_CSV)
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False)
+def load_data(mtimes=None):
     #Load forecast data from CSV files 
     try:
-        df_asset = pd.read_csv("output/asset_forecasts.csv")
-        df_portfolio = pd.read_csv("output/portfolio_forecast.csv")
+        df_asset = pd.read_csv(ASSET_CSV)
+        df_portfolio = pd.read_csv(PORTFOLIO_CSV)
         
         # Convert datetime
         df_asset['delivery_start'] = pd.to_datetime(df_asset['delivery_start'])
@@ -19,12 +31,19 @@ def load_data():
     except FileNotFoundError:
         return None, None, False
 
+@st.cache_data(show_spinner=False)
+def top_asset_ids(mtimes, num_assets, _df_asset):
+    # Assets with the highest mean forecast; the frame itself is not hashed,
+    # the file mtimes identify it
+    return _df_asset.groupby('asset_id')['value_kw'].mean().nlargest(num_assets).index
+
 def main():
     st.title("🔋 FlexPower Task 1: Asset & Portfolio Forecasting")
     # st.markdown("**Delivery Day: June 8, 2025**")
     
     # Load data
-    df_asset, df_portfolio, data_loaded = load_data()
+    mtimes = _file_mtimes()
+    df_asset, df_portfolio, data_loaded = load_data(mtimes)
     
     if not data_loaded:
         st.error("❌ CSV files not found. Please run the main forecasting script first.")
@@ -46,15 +65,10 @@ def main():
     with col1:
         st.subheader("📈 Portfolio Total Forecast")
         
-        # Portfolio chart
-        fig1, ax1 = plt.subplots(figsize=(10, 6))
-        ax1.plot(df_portfolio['delivery_start'], df_portfolio['portfolio_forecast_kw'] / 1000, 
-                linewidth=2, color='#1f77b4')
-        ax1.set_ylabel('Power (MW)')
-        ax1.set_title('Total Portfolio Forecast')
-        ax1.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        st.pyplot(fig1)
+        # Portfolio chart - rendered client-side by Vega-Lite, no figure/PNG pass
+        st.line_chart(
+            (df_portfolio.set_index('delivery_start')['portfolio_forecast_kw'] / 1000).rename('Power (MW)')
+        )
         
     with col2:
         st.subheader("🏭 Top Assets Forecast")
@@ -64,20 +78,20 @@ def main():
         num_assets = 4
         
         # Top assets chart
-        top_assets = df_asset.groupby('asset_id')['value_kw'].mean().nlargest(num_assets).index
-        
-        fig2, ax2 = plt.subplots(figsize=(10, 6))
-        for asset in top_assets:
-            asset_data = df_asset[df_asset['asset_id'] == asset]
-            ax2.plot(asset_data['delivery_start'], asset_data['value_kw'] / 1000, 
-                    label=f'Asset {asset}', linewidth=2)
+        top_assets = top_asset_ids(mtimes, num_assets, df_asset)
         
-        ax2.set_ylabel('Power (MW)')
-        ax2.set_title(f'Top {num_assets} Assets Forecast')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        st.pyplot(fig2)
+        # Select the top assets' rows in one pass and chart them in long form, one
+        # line per asset; overlapping forecast runs repeat timestamps, so no pivot
+        top_data = df_asset[df_asset['asset_id'].isin(top_assets)]
+        st.caption(f'Top {num_assets} Assets Forecast')
+        st.line_chart(
+            pd.DataFrame({
+                'delivery_start': top_data['delivery_start'],
+                'Power (MW)': top_data['value_kw'] / 1000,
+                'asset': 'Asset ' + top_data['asset_id'].astype(str)
+            }),
+            x='delivery_start', y='Power (MW)', color='asset'
+        )
     
     # Data tables
     st.subheader("📋 Forecast Data")
@@ -1,11 +1,47 @@
 # FlexPower Task 2: Best-of-Infeed Analysis
 
+import logging
 import os
+import sys
 import pandas as pd
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import numpy as np
 
+# Project root, for the helpers shared between tasks
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from json_records import iter_record_keys
+
+try:
+    from numba import get_num_threads, njit, prange
+except ImportError:  # optional (not in requirements.txt); the numpy path is used without it
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+# Row count above which the parallel numba aggregation beats sort + reduceat; the
+# sample data has a few thousand rows, so it only matters for much larger inputs
+NUMBA_MIN_ROWS = 1_000_000
+
+def _file_workers(filepaths):
+    """Thread count for per-file parsing: one per file, capped at the CPU count"""
+    return max(1, min(len(filepaths), os.cpu_count() or 1))
+
+def _read_asset_ids(filepath):
+    """Read the asset IDs referenced in a single JSON file"""
+    asset_ids = set()
+    try:
+        with open(filepath, 'rb') as f:
+            for key in iter_record_keys(f):
+                asset_id = key.get("asset_id")
+                if asset_id:
+                    asset_ids.add(asset_id)
+                    
+    except Exception as e:
+        print(e)
+    return asset_ids
+
 def extract_asset_ids(path):
     """Extract unique asset IDs from JSON files"""
     asset_ids = set()
@@ -14,143 +50,187 @@ def extract_asset_ids(path):
         print(f"ERROR Path does not exist: {path}")
         return []
     
-    for filename in os.listdir(path):
-        if filename.endswith('.json'):
-            filepath = os.path.join(path, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                    records = data if isinstance(data, list) else [data]
-                    
-                    for entry in records:
-                        asset_id = entry.get("key", {}).get("asset_id")
-                        if asset_id:
-                            asset_ids.add(asset_id)
-                            
-            except Exception as e:
-                print(e)
+    with os.scandir(path) as entries:
+        filepaths = [entry.path for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+    
+    # Files are independent, so read them concurrently
+    with ThreadPoolExecutor(max_workers=_file_workers(filepaths)) as executor:
+        for file_asset_ids in executor.map(_read_asset_ids, filepaths):
+            asset_ids.update(file_asset_ids)
     
     asset_ids = sorted(asset_ids)
     return asset_ids
 
-def load_live_measured_data(asset_dir):
-    "Load live measured infeed data from JSON files"
-    if not os.path.exists(asset_dir):
-        print(f"ERROR Directory not found: {asset_dir}")
-        return pd.DataFrame()
-    all_data = []
-    
-    for filename in os.listdir(asset_dir):
-        if filename.endswith('.json'):
-            filepath = os.path.join(asset_dir, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if not content.strip():
-                        continue
+def _parse_measured_file(filepath):
+    """Parse one live measured infeed file into (asset_id, asset_type, timestamps, values), or None if unusable"""
+    filename = os.path.basename(filepath)
+    try:
+        with open(filepath, 'rb') as f:
+            content = f.read()
+            if not content.strip():
+                return None
 
-                    try:
-                        data = json.loads(content)
-                    except json.JSONDecodeError as e:
-                        print(f"[WARNING] Invalid JSON in file:{e}")
-                        continue
+            try:
+                data = orjson.loads(content)
+            except orjson.JSONDecodeError as e:
+                logger.warning("Invalid JSON in file %s: %s", filename, e)
+                return None
 
-                    if not data:
-                        print(f"[WARNING] No data in file: {filename}")
-                        continue
+            if not data:
+                logger.warning("No data in file: %s", filename)
+                return None
 
-                    # Extract asset information
-                    asset_id = data.get('key', {}).get('asset_id') or data.get('key', {}).get('entity_id')
-                    if not asset_id:
-                        print(f"[WARNING] No asset_id in file: {filename}")
-                        continue
+            # Extract asset information
+            asset_id = data.get('key', {}).get('asset_id') or data.get('key', {}).get('entity_id')
+            if not asset_id:
+                logger.warning("No asset_id in file: %s", filename)
+                return None
 
-                    asset_type = 'WND' if 'WND' in asset_id else 'SOL' if 'SOL' in asset_id else 'UNKNOWN'
+            asset_type = 'WND' if 'WND' in asset_id else 'SOL' if 'SOL' in asset_id else 'UNKNOWN'
 
-                    # Get measurement data arrays
-                    values_array = data.get('values', [])
-                    if len(values_array) < 2:
-                        print(f"[WARNING] Insufficient values arrays in file: {filename}")
-                        continue
+            # Get measurement data arrays
+            values_array = data.get('values', [])
+            if len(values_array) < 2:
+                logger.warning("Insufficient values arrays in file: %s", filename)
+                return None
 
-                    timestamps = values_array[0]  # First array contains timestamps in milliseconds
-                    values = values_array[1]      # Second array contains measured values in kW
+            timestamps = values_array[0]  # First array contains timestamps in milliseconds
+            values = values_array[1]      # Second array contains measured values in kW
 
-                    if not timestamps or not values:
-                        print(f"[WARNING] Empty timestamps or values in file: {filename}")
-                        continue
+            if not timestamps or not values:
+                logger.warning("Empty timestamps or values in file: %s", filename)
+                return None
 
-                    if len(timestamps) != len(values):
-                        print(f"[WARNING] Mismatched timestamps and values lengths in file: {filename}")
-                        continue
-                    
-                    # Process measurements
-                    if len(timestamps) == len(values):
-                        for ts, val in zip(timestamps, values):
-                            # Convert milliseconds timestamp to datetime in Europe/Berlin timezone
-                            delivery_start = pd.Timestamp(ts, unit='ms', tz='UTC').tz_convert('Europe/Berlin')
-                            
-                            # Filter out invalid measurements
-                            if val >= 0:  # Only use non-negative values
-                                all_data.append({
-                                    'asset_id': asset_id,
-                                    'asset_type': asset_type,
-                                    'delivery_start': delivery_start,
-                                    'measured_kw': float(val),
-                                    'timestamp': delivery_start
-                                })
-                        
-            except Exception as e:
-                print(f"ERROR Failed to read {filename}: {e}")
+            if len(timestamps) != len(values):
+                logger.warning("Mismatched timestamps and values lengths in file: %s", filename)
+                return None
+            
+            # Process measurements as arrays, only use non-negative values
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            values = np.asarray(values, dtype=np.float64)
+            keep = values >= 0
+            return asset_id, asset_type, timestamps[keep], values[keep]
                 
-    df = pd.DataFrame(all_data)
+    except Exception as e:
+        logger.error("Failed to read %s: %s", filename, e)
+    return None
+
+def _group_sum_count_sorted(keys, values):
+    """Per-group sums and counts via a stable sort and np.add.reduceat over the runs"""
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1))
+    sums = np.add.reduceat(values[order], starts)
+    counts = np.diff(np.append(starts, len(keys)))
+    return sorted_keys[starts], sums, counts
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _dense_sum_count(keys, values, n_groups, n_chunks):
+        chunk_size = (keys.size + n_chunks - 1) // n_chunks
+        sums = np.zeros((n_chunks, n_groups))
+        counts = np.zeros((n_chunks, n_groups), dtype=np.int64)
+        # Each chunk reduces into its own row, so threads never write the same slot
+        for c in prange(n_chunks):
+            for i in range(c * chunk_size, min((c + 1) * chunk_size, keys.size)):
+                sums[c, keys[i]] += values[i]
+                counts[c, keys[i]] += 1
+        return sums.sum(axis=0), counts.sum(axis=0)
+
+def _group_sum_count(keys, values, n_groups):
+    """Per-group sums and counts for integer keys in [0, n_groups), returned in key order for non-empty groups"""
+    # The dense kernel keeps a row of n_groups slots per thread, so sparse key sets
+    # (more possible groups than rows) stay on the sort-based path
+    if njit is None or keys.size < NUMBA_MIN_ROWS or n_groups > keys.size:
+        return _group_sum_count_sorted(keys, values)
+    sums, counts = _dense_sum_count(keys, values, n_groups, get_num_threads())
+    group_keys = np.flatnonzero(counts)
+    return group_keys, sums[group_keys], counts[group_keys]
+
+def load_live_measured_data(asset_dir):
+    "Load live measured infeed data from JSON files"
+    if not os.path.exists(asset_dir):
+        logger.error("Directory not found: %s", asset_dir)
+        return pd.DataFrame()
+    with os.scandir(asset_dir) as entries:
+        filepaths = [entry.path for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+    
+    # Parse files concurrently, then collect results in directory order
+    with ThreadPoolExecutor(max_workers=_file_workers(filepaths)) as executor:
+        parsed_files = [parsed for parsed in executor.map(_parse_measured_file, filepaths) if parsed is not None]
+    
+    # Concatenate the per-file arrays and broadcast each file's asset id/type over its rows
+    file_asset_ids = [parsed[0] for parsed in parsed_files]
+    file_asset_types = [parsed[1] for parsed in parsed_files]
+    file_lengths = [len(parsed[3]) for parsed in parsed_files]
+    timestamps_ms = np.concatenate([parsed[2] for parsed in parsed_files]) if parsed_files else np.empty(0)
+    measured_kw = np.concatenate([parsed[3] for parsed in parsed_files]) if parsed_files else np.empty(0)
+    asset_ids = np.repeat(np.array(file_asset_ids, dtype=object), file_lengths)
+    asset_types = np.repeat(np.array(file_asset_types, dtype=object), file_lengths)
+    
+    # delivery_start is binned to its 15-minute interval on the raw UTC milliseconds
+    # (Berlin offsets are whole hours) and grouped on those integers; only the distinct
+    # intervals are converted to Europe/Berlin timestamps, not every measurement
+    interval_ms = timestamps_ms - np.mod(timestamps_ms, 15 * 60 * 1000)
+    df = pd.DataFrame({
+        'asset_id': pd.Categorical(asset_ids),
+        'asset_type': pd.Categorical(asset_types),
+        'measured_kw': measured_kw
+    })
     if not df.empty:
         # print(df.shape)
         # print(df['delivery_start'].head())
         # print(df['measured_kw'].head())
         
-        # Ensure consistent timezone handling
-        df['delivery_start'] = pd.to_datetime(df['delivery_start'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        
-        print(df['delivery_start'].head())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Measured timestamps:\n%s",
+                         pd.to_datetime(timestamps_ms[:5], unit='ms', utc=True).tz_convert('Europe/Berlin'))
         
         # Group by 15-minute intervals to match forecast data format
         # Use mean for regular power measurements (kW)
-        df['delivery_start'] = df['delivery_start'].dt.floor('15min')
-        
-        print(df['delivery_start'].head())
         
-        # First calculate the mean and count
-        agg_df = df.groupby(['asset_id', 'asset_type', 'delivery_start']).agg({
-            'measured_kw': ['mean', 'count']
-        }).reset_index()
+        # First calculate the mean and count per (asset, interval) on sorted integer keys
+        asset_codes, asset_uniques = pd.factorize(df['asset_id'], sort=True)
+        interval_codes, interval_uniques_ms = pd.factorize(interval_ms, sort=True)
+        interval_uniques = pd.to_datetime(interval_uniques_ms, unit='ms', utc=True).tz_convert('Europe/Berlin')
+        logger.debug("Measured intervals:\n%s", interval_uniques[interval_codes[:5]])
+        keys = asset_codes.astype(np.int64) * len(interval_uniques) + interval_codes
+        group_keys, sums, counts = _group_sum_count(
+            keys, df['measured_kw'].to_numpy(), len(asset_uniques) * len(interval_uniques)
+        )
         
-        print(agg_df.shape)
+        # asset_type follows asset_id, so look up each asset's type code from its first row
+        _, first_rows = np.unique(asset_codes, return_index=True)
+        asset_type_codes = df['asset_type'].cat.codes.to_numpy()[first_rows]
         
-        # Flatten column names
-        agg_df.columns = ['asset_id', 'asset_type', 'delivery_start', 'measured_kw', 'measurement_count']
+        logger.debug("Aggregated %d (asset, interval) groups", len(group_keys))
         
-        print(agg_df['measured_kw'].head())
-        print(agg_df['measurement_count'].head())
+        # Filter for data quality (keeping measurements for any date) on the group
+        # arrays, so the frame is only built for retained intervals
+        keep = counts >= 3  # Require at least 3 measurements per interval
+        group_keys, sums, counts = group_keys[keep], sums[keep], counts[keep]
         
-        # Filter for data quality (keeping measurements for any date)
-        agg_df = agg_df[
-            agg_df['measurement_count'] >= 3  # Require at least 3 measurements per interval
-        ]
+        agg_df = pd.DataFrame({
+            'asset_id': asset_uniques[group_keys // len(interval_uniques)],
+            'asset_type': pd.Categorical.from_codes(
+                asset_type_codes[group_keys // len(interval_uniques)], dtype=df['asset_type'].dtype
+            ),
+            'delivery_start': interval_uniques[group_keys % len(interval_uniques)],
+            'measured_kw': sums / counts
+        })
         
-        print("Unique dates found:", sorted(agg_df['delivery_start'].dt.date.unique()))
+        logger.debug("Aggregated measured_kw:\n%s", agg_df['measured_kw'].head())
         
-        print("After date filter shape:", agg_df.shape)
+        # The unique-date scan is only worth doing when the debug output is shown
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Unique dates found: %s", sorted(agg_df['delivery_start'].dt.date.unique()))
         
-        # Drop the measurement count column
-        agg_df = agg_df.drop('measurement_count', axis=1)
+        logger.debug("After date filter shape: %s", agg_df.shape)
         
         # Handle potential NaN values
         agg_df['measured_kw'] = agg_df['measured_kw'].fillna(0)
     
-    # total_measurements = len(all_data)
+    # total_measurements = len(measured_kw)
     # intervals_with_data = len(agg_df) if not df.empty else 0
     # print(f"Processed {total_measurements} measurements into {intervals_with_data} 15-minute intervals")
     return agg_df
@@ -158,8 +238,8 @@ def load_live_measured_data(asset_dir):
 def load_forecast_data():
     #Load forecast data for comparison
     try:
-        df_forecast = pd.read_csv("../Task1/output/asset_forecasts.csv")
-        df_forecast['delivery_start'] = pd.to_datetime(df_forecast['delivery_start']).dt.tz_localize(None)
+        df_forecast = pd.read_csv("../Task1/output/asset_forecasts.csv", dtype={'asset_id': 'category'})
+        df_forecast['delivery_start'] = pd.to_datetime(df_forecast['delivery_start'], format='%Y-%m-%d %H:%M:%S', cache=True)
         print(f"Loaded {len(df_forecast)} forecast records")
         return df_forecast
     except FileNotFoundError:
@@ -170,90 +250,97 @@ def compute_best_of_infeed_asset_level(df_measured, df_forecast):
     #Compute best-of-infeed for each asset
     if df_forecast.empty:
         # If no forecast data, use measured data only with quality checks
-        best_of_infeed = df_measured.copy()
-        best_of_infeed['forecast_kw'] = 0
-        best_of_infeed['best_of_infeed_kw'] = best_of_infeed['measured_kw']
-        best_of_infeed['data_source'] = 'measured'
+        best_of_infeed = df_measured.assign(
+            forecast_kw=0.0,
+            best_of_infeed_kw=df_measured['measured_kw'],
+            data_source='measured'
+        )
     else:
-        # Prepare forecast data with proper timezone handling
-        df_forecast = df_forecast.rename(columns={'value_kw': 'forecast_kw'})
-        df_forecast['delivery_start'] = pd.to_datetime(df_forecast['delivery_start']).dt.tz_localize('Europe/Berlin')
+        # Prepare forecast data with proper timezone handling; the derived columns
+        # are kept as local series rather than written back into a renamed copy
+        forecast_start = df_forecast['delivery_start'].dt.tz_localize('Europe/Berlin')
         
         # Adjust measured data date to match forecast date
         # First convert to datetime without timezone
-        target_date = pd.to_datetime(df_forecast['delivery_start'].iloc[0]).tz_localize(None).date()
+        target_date = forecast_start.iloc[0].tz_localize(None).date()
         measured_date = df_measured['delivery_start'].iloc[0].tz_localize(None).date()
         days_diff = (target_date - measured_date).days
         
         print("[DEBUG] Adjusting measured date by", days_diff, "days")
-        df_measured['delivery_start'] = df_measured['delivery_start'] + pd.Timedelta(days=days_diff)
+        # Both sides are Europe/Berlin-aware now, so the shifted measured intervals
+        # can be matched directly, without a naive round-trip on a copy of the frame
+        measured_start = df_measured['delivery_start'] + pd.Timedelta(days=days_diff)
         
-        # Extract asset type from asset_id for forecasts
-        df_forecast['asset_type'] = df_forecast['asset_id'].apply(
-            lambda x: 'WND' if 'WND' in x else 'SOL' if 'SOL' in x else 'UNKNOWN'
+        # Extract asset type from asset_id for forecasts; the type only depends on
+        # the id, so it is derived once per category rather than once per row
+        forecast_ids = df_forecast['asset_id'].cat
+        type_codes, type_uniques = pd.factorize(
+            forecast_ids.categories.map(lambda x: 'WND' if 'WND' in x else 'SOL' if 'SOL' in x else 'UNKNOWN'),
+            sort=True
+        )
+        forecast_type = pd.Categorical.from_codes(
+            type_codes[forecast_ids.codes.to_numpy()], categories=type_uniques
         )
         
         # Merge forecast and measured data with asset type information
-        # First convert delivery_start to same timezone
-        df_measured_tz_naive = df_measured.copy()
-        df_measured_tz_naive['delivery_start'] = df_measured_tz_naive['delivery_start'].dt.tz_localize(None).dt.tz_localize('Europe/Berlin')
-        
-        merged = pd.merge(
-            df_forecast[['asset_id', 'asset_type', 'delivery_start', 'forecast_kw']], 
-            df_measured_tz_naive[['asset_id', 'delivery_start', 'measured_kw']],
-            on=['asset_id', 'delivery_start'],
-            how='outer'
+        # Map both key columns into a shared integer space so the merge joins
+        # on int codes instead of hashing strings and timestamps: asset_id via
+        # one categorical dtype over both frames' categories, delivery_start via
+        # factorize. Sorted codes keep the lexicographic row order of the outer merge.
+        n_forecast = len(df_forecast)
+        asset_dtype = pd.CategoricalDtype(sorted(
+            set(df_forecast['asset_id'].cat.categories) | set(df_measured['asset_id'].cat.categories)
+        ))
+        forecast_asset_codes = df_forecast['asset_id'].astype(asset_dtype).cat.codes.to_numpy()
+        measured_asset_codes = df_measured['asset_id'].astype(asset_dtype).cat.codes.to_numpy()
+        ts_codes, ts_uniques = pd.factorize(
+            pd.concat([forecast_start, measured_start], ignore_index=True), sort=True
         )
+        forecast_keys = pd.DataFrame({
+            'asset_code': forecast_asset_codes.astype(np.int32),
+            'ts_code': ts_codes[:n_forecast].astype(np.int32),
+            'asset_type': forecast_type,
+            'forecast_kw': df_forecast['value_kw'].to_numpy()
+        })
+        measured_keys = pd.DataFrame({
+            'asset_code': measured_asset_codes.astype(np.int32),
+            'ts_code': ts_codes[n_forecast:].astype(np.int32),
+            'measured_kw': df_measured['measured_kw'].to_numpy()
+        })
         
-        # Fill missing values appropriately
-        merged['measured_kw'] = merged['measured_kw'].fillna(0)
-        merged['forecast_kw'] = merged['forecast_kw'].fillna(0)
+        # Join the integer codes with an ordered (sort-merge) outer join; it yields
+        # the same (asset, interval) row order as the hash merge did
+        merged = pd.merge_ordered(forecast_keys, measured_keys, on=['asset_code', 'ts_code'], how='outer')
         
-        # Convert to numeric and apply quality checks
-        for col in ['measured_kw', 'forecast_kw']:
-            merged[col] = pd.to_numeric(merged[col], errors='coerce')
-            # Remove physically impossible values (e.g., negative power)
-            merged.loc[merged[col] < 0, col] = 0
+        # Fill missing values (unmatched rows of the outer merge) with 0 and
+        # remove physically impossible values (e.g., negative power), in place
+        forecast_kw = np.nan_to_num(merged['forecast_kw'].to_numpy(dtype=np.float64))
+        measured_kw = np.nan_to_num(merged['measured_kw'].to_numpy(dtype=np.float64))
+        np.maximum(forecast_kw, 0, out=forecast_kw)
+        np.maximum(measured_kw, 0, out=measured_kw)
         
-        # Compute best-of-infeed based on asset type and data quality
-        merged['best_of_infeed_kw'] = merged.apply(
-            lambda row: max(
-                row['forecast_kw'] if row['forecast_kw'] >= 0 else 0,
-                row['measured_kw'] if row['measured_kw'] >= 0 else 0
-            ),
-            axis=1
-        )
+        # Compute best-of-infeed based on asset type and data quality, directly
+        # on the contiguous float64 arrays into a preallocated output
+        best_of_infeed_kw = np.empty_like(forecast_kw)
+        np.maximum(forecast_kw, measured_kw, out=best_of_infeed_kw)
         
-        # Track which value was used for best-of-infeed
-        merged['data_source'] = merged.apply(
-            lambda row: 'measured' if row['measured_kw'] > row['forecast_kw'] else 'forecast',
-            axis=1
-        )
-        
-        best_of_infeed = merged[[
-            'asset_id', 'asset_type', 'delivery_start', 
-            'forecast_kw', 'measured_kw', 'best_of_infeed_kw', 
-            'data_source'
-        ]].copy()
+        # Build the output once from the merge codes and the cleaned arrays,
+        # tracking which value was used for best-of-infeed
+        best_of_infeed = pd.DataFrame({
+            'asset_id': pd.Categorical.from_codes(merged['asset_code'].to_numpy(), dtype=asset_dtype),
+            'asset_type': merged['asset_type'].array,
+            'delivery_start': ts_uniques[merged['ts_code'].to_numpy()],
+            'forecast_kw': forecast_kw,
+            'measured_kw': measured_kw,
+            'best_of_infeed_kw': best_of_infeed_kw,
+            'data_source': np.where(measured_kw > forecast_kw, 'measured', 'forecast')
+        })
     
-    # Ensure numeric columns are properly typed
-    numeric_cols = ['forecast_kw', 'measured_kw', 'best_of_infeed_kw']
-    for col in numeric_cols:
-        if col in best_of_infeed.columns:
-            best_of_infeed[col] = pd.to_numeric(best_of_infeed[col], errors='coerce').fillna(0)
     return best_of_infeed
 
 def compute_portfolio_best_of_infeed(df_asset_best_of_infeed):
     # Aggregate best-of-infeed to portfolio level
 
-    # First compute type-specific aggregations
-    type_agg = df_asset_best_of_infeed.groupby(['delivery_start', 'asset_type']).agg({
-        'forecast_kw': 'sum',
-        'measured_kw': 'sum',
-        'best_of_infeed_kw': 'sum',
-        'asset_id': 'count'  # Count of assets contributing to each interval
-    }).reset_index()
-    
     # Compute portfolio totals
     portfolio_best_of_infeed = df_asset_best_of_infeed.groupby('delivery_start').agg({
         'forecast_kw': 'sum',
@@ -281,7 +368,7 @@ def calculate_best_of_infeed_metrics(df_asset, df_portfolio):
     # Asset level metrics
     total_assets = df_asset['asset_id'].nunique()
     avg_best_of_infeed = df_asset['best_of_infeed_kw'].mean()
-    max_asset_performance = df_asset.groupby('asset_id')['best_of_infeed_kw'].max().max()
+    max_asset_performance = df_asset['best_of_infeed_kw'].max()  # max of per-asset maxima
     
     # Portfolio level metrics  
     portfolio_peak = df_portfolio['portfolio_best_of_infeed_kw'].max()
@@ -315,26 +402,18 @@ def save_best_of_infeed_data(df_asset, df_portfolio, metrics):
     
     os.makedirs("output", exist_ok=True)
     
-    # Save data
-    df_asset.to_csv("output/asset_best_of_infeed.csv", index=False)
+    # Save data - the asset-level frame as Parquet, the small portfolio summary as CSV
+    df_asset.to_parquet("output/asset_best_of_infeed.parquet", engine='pyarrow', compression='snappy', index=False)
     df_portfolio.to_csv("output/portfolio_best_of_infeed.csv", index=False)
     
-    # Convert numpy types to Python native types for JSON serialization
-    json_metrics = {}
-    for key, value in metrics.items():
-        if isinstance(value, (np.int64, np.int32)):
-            json_metrics[key] = int(value)
-        elif isinstance(value, (np.float64, np.float32)):
-            json_metrics[key] = float(value)
-        else:
-            json_metrics[key] = value
-    
-    # Save metrics
-    with open("output/best_of_infeed_metrics.json", 'w') as f:
-        json.dump(json_metrics, f, indent=2)
+    # Save metrics - orjson serializes the numpy scalars directly
+    with open("output/best_of_infeed_metrics.json", 'wb') as f:
+        f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
 
 def main():
+    # Warnings and errors keep their [LEVEL] prefix; debug output stays off unless enabled
+    logging.basicConfig(format="[%(levelname)s] %(message)s")
    
     # Data directories - normalized path handling
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
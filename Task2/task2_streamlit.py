@@ -1,28 +1,40 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import json
+import os
 
 st.set_page_config(page_title="FlexPower Task 2 - Best-of-Infeed", layout="wide")
 
-def load_data():
+OUTPUT_FILES = (
+    "output/asset_best_of_infeed.parquet",
+    "output/portfolio_best_of_infeed.csv",
+    "output/best_of_infeed_metrics.json",
+)
+
+def _file_mtimes():
+    # Modification times of the Task 2 outputs, passed to load_data so a new
+    # run of best_of_infeed.py invalidates the cached frames
+    try:
+        return tuple(os.path.getmtime(path) for path in OUTPUT_FILES)
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False)
+def load_data(mtimes=None):
     # Load data safely
     try:
-        df_asset = pd.read_csv("output/asset_best_of_infeed.csv")
+        df_asset = pd.read_parquet("output/asset_best_of_infeed.parquet")
         df_portfolio = pd.read_csv("output/portfolio_best_of_infeed.csv")
         
-        # Convert datetime
-        df_asset['delivery_start'] = pd.to_datetime(df_asset['delivery_start'])
+        # Convert datetime (Parquet already stores df_asset's column as datetime)
         df_portfolio['delivery_start'] = pd.to_datetime(df_portfolio['delivery_start'])
         
-        # Convert ALL numeric columns to float
-        for col in df_asset.columns:
-            if 'kw' in col.lower():
-                df_asset[col] = pd.to_numeric(df_asset[col], errors='coerce').fillna(0)
-        
-        for col in df_portfolio.columns:
-            if 'kw' in col.lower():
-                df_portfolio[col] = pd.to_numeric(df_portfolio[col], errors='coerce').fillna(0)
+        # Convert ALL numeric columns to float32 - the dashboard only plots and
+        # shows them, so half-width columns are plenty and halve the scans
+        for df in (df_asset, df_portfolio):
+            for col in df.columns:
+                if 'kw' in col.lower():
+                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('float32')
         
         with open("output/best_of_infeed_metrics.json", 'r') as f:
             metrics = json.load(f)
@@ -35,7 +47,7 @@ def load_data():
 st.title("⚡ FlexPower Task 2: Best-of-Infeed Analysis")
 
 # Load data
-df_asset, df_portfolio, metrics, loaded = load_data()
+df_asset, df_portfolio, metrics, loaded = load_data(_file_mtimes())
 
 if not loaded:
     st.error(" Please run task2_best_of_infeed.py first")
@@ -51,46 +63,36 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("📈 Portfolio Best-of-Infeed")
-    fig1, ax1 = plt.subplots(figsize=(10, 6))
-    ax1.plot(df_portfolio['delivery_start'], df_portfolio['portfolio_best_of_infeed_kw'] / 1000, 
-             linewidth=3, color='red', label='Best-of-Infeed')
+    # Rendered client-side by Vega-Lite; no matplotlib figure or PNG per rerun
+    portfolio_columns = {'portfolio_best_of_infeed_kw': 'Best-of-Infeed'}
     if 'portfolio_forecast_kw' in df_portfolio.columns:
-        ax1.plot(df_portfolio['delivery_start'], df_portfolio['portfolio_forecast_kw'] / 1000, 
-                linewidth=2, color='blue', alpha=0.7, label='Forecast')
-    ax1.set_ylabel('Power (MW)')
-    ax1.set_title('Portfolio Analysis')
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
-    st.pyplot(fig1)
+        portfolio_columns['portfolio_forecast_kw'] = 'Forecast'
+    st.line_chart(
+        (df_portfolio.set_index('delivery_start')[list(portfolio_columns)] / 1000).rename(columns=portfolio_columns),
+        color=['#ff0000', '#0000ff'][:len(portfolio_columns)]
+    )
 
 with col2:
     st.subheader("🏭 Top Assets")
     # num_assets = st.selectbox("Number of assets:", [3, 5, 8], index=1)
     num_assets = 4
-    # Safe way to get top assets - no nlargest!
-    asset_means = {}
-    for asset in df_asset['asset_id'].unique():
-        asset_data = df_asset[df_asset['asset_id'] == asset]
-        mean_value = asset_data['best_of_infeed_kw'].mean()
-        asset_means[asset] = mean_value
-    
-    # Sort manually
-    sorted_assets = sorted(asset_means.items(), key=lambda x: x[1], reverse=True)
-    top_assets = [asset[0] for asset in sorted_assets[:num_assets]]
-    
-    fig2, ax2 = plt.subplots(figsize=(10, 6))
-    for asset in top_assets:
-        asset_data = df_asset[df_asset['asset_id'] == asset]
-        ax2.plot(asset_data['delivery_start'], asset_data['best_of_infeed_kw'] / 1000, 
-                label=f'Asset {asset}', linewidth=2)
+    # Top assets by mean best-of-infeed from a single grouped pass; ties keep
+    # first-appearance order like the stable sort did
+    top_assets = (df_asset.groupby('asset_id', sort=False, observed=True)['best_of_infeed_kw']
+                  .mean().nlargest(num_assets).index.tolist())
     
-    ax2.set_ylabel('Power (MW)')
-    ax2.set_title(f'Top {num_assets} Assets')
-    ax2.legend()
-    ax2.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
-    st.pyplot(fig2)
+    # Filter to the top assets once and chart them in long form, one line per
+    # asset; assets repeat timestamps across forecast runs, so no pivot
+    top_data = df_asset[df_asset['asset_id'].isin(top_assets)]
+    st.caption(f'Top {num_assets} Assets')
+    st.line_chart(
+        pd.DataFrame({
+            'delivery_start': top_data['delivery_start'],
+            'Power (MW)': top_data['best_of_infeed_kw'] / 1000,
+            'asset': 'Asset ' + top_data['asset_id'].astype(str)
+        }),
+        x='delivery_start', y='Power (MW)', color='asset'
+    )
 
 # Data tables
 st.subheader("📋 Data")
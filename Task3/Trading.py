@@ -3,7 +3,41 @@
 import pandas as pd
 import numpy as np
 import os
-import json
+import orjson
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional (not in requirements.txt); the numpy path is used without it
+    njit = None
+
+# Labels of the simulated trading assets, in code order
+ASSET_LABELS = [f"A{code + 1:02d}" for code in range(10)]
+
+# Trade count above which the fused numba kernel beats the numpy passes; the
+# sample data has a few thousand trades, so it only matters for much larger inputs
+NUMBA_MIN_ROWS = 1_000_000
+
+def _signed_values_numpy(price, volume, sign):
+    """Revenue and signed volume as separate vectorized passes"""
+    signed_volume = volume * sign
+    return signed_volume * price, signed_volume
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _signed_values_fused(price, volume, sign):
+        # One pass over the trades instead of a temporary per operation
+        revenue = np.empty_like(price)
+        signed_volume = np.empty_like(price)
+        for i in prange(price.shape[0]):
+            signed_volume[i] = volume[i] * sign[i]
+            revenue[i] = signed_volume[i] * price[i]
+        return revenue, signed_volume
+
+def _signed_values(price, volume, sign):
+    """Per-trade revenue and signed volume (sell = +1, buy = -1)"""
+    if njit is None or price.size < NUMBA_MIN_ROWS:
+        return _signed_values_numpy(price, volume, sign)
+    return _signed_values_fused(price, volume, sign)
 
 def load_trading_data():
     # Load actual trading data from CSV files
@@ -11,13 +45,13 @@ def load_trading_data():
     
     # Load private trades
     private_file = "../DataEngineeringChallenge/DataEngineeringChallenge/src/exchange/Private_Trades-20250608-20250609T000516000Z.csv"
-    df_private = pd.read_csv(private_file, sep=';',skiprows=1)
+    df_private = pd.read_csv(private_file, sep=';', header=1, engine='pyarrow')
     # print(f" Loaded {len(df_private)} private trades")
     print(df_private.head())
     
     # Load public trades  
     public_file = "../DataEngineeringChallenge/DataEngineeringChallenge/src/exchange/Public_Trades-20250608-20250609T000516000Z.csv"
-    df_public = pd.read_csv(public_file, sep=';',skiprows=1)
+    df_public = pd.read_csv(public_file, sep=';', header=1, engine='pyarrow')
     print(df_public.head())
     # print(f" Loaded {len(df_public)} public trades")
     
@@ -26,23 +60,30 @@ def load_trading_data():
 def prepare_trading_data(df_trades):
     #Clean and prepare trading data for analysis
 
-    # Convert timestamps
-    df_trades['DeliveryStart'] = pd.to_datetime(df_trades['DeliveryStart'])
-    if 'DeliveryEnd' in df_trades.columns:
-        df_trades['DeliveryEnd'] = pd.to_datetime(df_trades['DeliveryEnd'])
+    # Timestamps are already parsed by the pyarrow CSV reader in load_trading_data
     
-    # Standardize column names and values
-    df_trades['side'] = df_trades['Side'].str.lower()
+    # Standardize column names and values; side is categorical so the
+    # buy/sell comparisons downstream run on integer codes
+    df_trades['side'] = df_trades['Side'].str.lower().astype('category')
     df_trades['volume_mw'] = df_trades['Volume']
     df_trades['price_eur_mwh'] = df_trades['Price']
     
-    # Add revenue calculation
-    df_trades['multiplier'] = df_trades['side'].map({'sell': 1, 'buy': -1})
-    df_trades['revenue_eur'] = df_trades['volume_mw'] * df_trades['price_eur_mwh'] * df_trades['multiplier']
-    df_trades['signed_volume'] = df_trades['volume_mw'] * df_trades['multiplier']
-    
-    # Add asset_id for grouping (create simple groups based on trade patterns)
-    df_trades['asset_id'] = 'A' + (df_trades.index % 10 + 1).astype(str).str.zfill(2)
+    # Add revenue calculation (sell = +1, buy = -1), looked up per category code;
+    # the trailing -1.0 covers code -1 (missing side), as the string compare did
+    side = df_trades['side'].cat
+    sign = np.append(np.where(side.categories == 'sell', 1.0, -1.0), -1.0)[side.codes.to_numpy()]
+    revenue, signed_volume = _signed_values(
+        df_trades['price_eur_mwh'].to_numpy(dtype=np.float64),
+        df_trades['volume_mw'].to_numpy(dtype=np.float64),
+        sign
+    )
+    df_trades['revenue_eur'] = revenue
+    df_trades['signed_volume'] = signed_volume
+    
+    # Add asset_id for grouping (create simple groups based on trade patterns); a
+    # categorical over 'A01'..'A10' built from int8 codes, so no per-row strings
+    asset_codes = (np.arange(len(df_trades)) % 10).astype(np.int8)
+    df_trades['asset_id'] = pd.Categorical.from_codes(asset_codes, categories=ASSET_LABELS)
     
     return df_trades
 
@@ -52,21 +93,18 @@ def calculate_trading_metrics(df_trades):
     # Prepare data
     df_trades = prepare_trading_data(df_trades)
     
-    # Asset-level metrics
-    asset_metrics = df_trades.groupby('asset_id').agg({
-        'revenue_eur': 'sum',
-        'signed_volume': 'sum',  
-        'TradeId': 'count',      
-        'volume_mw': 'sum',     
-        'price_eur_mwh': lambda x: np.average(x, weights=df_trades.loc[x.index, 'volume_mw'])  # VWAP
-    }).reset_index()
-    
-    asset_metrics.rename(columns={
-        'TradeId': 'num_trades',
-        'signed_volume': 'net_volume_mw',
-        'volume_mw': 'total_volume_mw',
-        'price_eur_mwh': 'vwap_eur_mwh'
-    }, inplace=True)
+    # Asset-level metrics (VWAP = sum(price * volume) / sum(volume))
+    price_volume = df_trades['price_eur_mwh'] * df_trades['volume_mw']
+    asset_metrics = df_trades.assign(price_volume=price_volume).groupby('asset_id', observed=True).agg(
+        revenue_eur=('revenue_eur', 'sum'),
+        net_volume_mw=('signed_volume', 'sum'),
+        num_trades=('TradeId', 'count'),
+        total_volume_mw=('volume_mw', 'sum'),
+        price_volume=('price_volume', 'sum')
+    ).reset_index()
+    asset_metrics['asset_id'] = asset_metrics['asset_id'].astype(str)
+    
+    asset_metrics['vwap_eur_mwh'] = asset_metrics.pop('price_volume') / asset_metrics['total_volume_mw']
     
     # Portfolio totals
     portfolio_metrics = {
@@ -85,12 +123,12 @@ def save_trading_data(df_trades, asset_metrics, portfolio_metrics):
     os.makedirs("output", exist_ok=True)
     
     # Save data
-    df_trades.to_csv("output/trading_data.csv", index=False)
+    df_trades.to_parquet("output/trading_data.parquet", engine='pyarrow', compression='snappy', index=False)
     asset_metrics.to_csv("output/asset_trading_metrics.csv", index=False)
     
     # Save portfolio metrics
-    with open("output/portfolio_trading_metrics.json", 'w') as f:
-        json.dump(portfolio_metrics, f, indent=2)
+    with open("output/portfolio_trading_metrics.json", 'wb') as f:
+        f.write(orjson.dumps(portfolio_metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     print(" Trading data saved to output/ directory")
 
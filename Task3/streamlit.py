@@ -2,6 +2,7 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import json
@@ -15,8 +16,8 @@ st.set_page_config(page_title="FlexPower Trading Metrics", page_icon="⚡", layo
 def load_data():
     # Load trading data
     # Try to load saved data first
-    if Path("output/trading_data.csv").exists():
-        df_trades = pd.read_csv("output/trading_data.csv")
+    if Path("output/trading_data.parquet").exists():
+        df_trades = pd.read_parquet("output/trading_data.parquet")
         asset_metrics = pd.read_csv("output/asset_trading_metrics.csv")
         with open("output/portfolio_trading_metrics.json", 'r') as f:
             portfolio_metrics = json.load(f)
@@ -27,10 +28,24 @@ def load_data():
     
     return df_trades, asset_metrics, portfolio_metrics
 
-def create_revenue_chart(df_trades):
+def _trades_key(df_trades):
+    # Cheap fingerprint of the trades frame; the chart builders below are cached
+    # on it instead of hashing the whole frame on every rerun
+    return len(df_trades), float(df_trades['revenue_eur'].sum())
+
+def _side_totals(df_trades):
+    # Revenue and volume per side in one grouped pass, shared by the revenue and
+    # volume charts; a side without trades gets zeros
+    return df_trades.groupby('side', sort=False, observed=True).agg(
+        revenue=('revenue_eur', 'sum'),
+        volume=('volume_mw', 'sum')
+    ).reindex(['buy', 'sell'], fill_value=0.0)
+
+@st.cache_data(show_spinner=False)
+def create_revenue_chart(side_totals):
     # Simple revenue chart
-    buy_revenue = df_trades[df_trades['side'] == 'buy']['revenue_eur'].sum()
-    sell_revenue = df_trades[df_trades['side'] == 'sell']['revenue_eur'].sum()
+    buy_revenue = side_totals.at['buy', 'revenue']
+    sell_revenue = side_totals.at['sell', 'revenue']
     net_revenue = buy_revenue + sell_revenue
     
     fig = go.Figure(data=[
@@ -43,10 +58,11 @@ def create_revenue_chart(df_trades):
     fig.update_layout(title="Trading Revenue Breakdown", height=400, showlegend=False)
     return fig
 
-def create_volume_chart(df_trades):
+@st.cache_data(show_spinner=False)
+def create_volume_chart(side_totals):
     # Simple volume chart
-    buy_volume = df_trades[df_trades['side'] == 'buy']['volume_mw'].sum()
-    sell_volume = df_trades[df_trades['side'] == 'sell']['volume_mw'].sum()
+    buy_volume = side_totals.at['buy', 'volume']
+    sell_volume = side_totals.at['sell', 'volume']
     
     fig = go.Figure(data=[
         go.Bar(x=['Buy Volume', 'Sell Volume'], 
@@ -58,23 +74,29 @@ def create_volume_chart(df_trades):
     fig.update_layout(title="Trading Volume (MW)", height=400, showlegend=False)
     return fig
 
-def create_trades_timeline(df_trades):
+@st.cache_data(show_spinner=False)
+def create_trades_timeline(trades_key, _df_trades):
+    df_trades = _df_trades
     # Simple timeline chart
-    df_trades['DeliveryStart'] = pd.to_datetime(df_trades['DeliveryStart'])
-    df_trades['hour'] = df_trades['DeliveryStart'].dt.hour
+    hour = pd.to_datetime(df_trades['DeliveryStart']).dt.hour.to_numpy()
+    is_buy = (df_trades['side'] == 'buy').to_numpy()
+    is_sell = (df_trades['side'] == 'sell').to_numpy()
     
-    # Count trades by hour and side
-    hourly_data = df_trades.groupby(['hour', 'side']).size().unstack(fill_value=0)
+    # Count trades by hour and side with one bincount per side (24 bins), keeping
+    # only the hours that saw any trade
+    buy_counts = np.bincount(hour[is_buy], minlength=24)
+    sell_counts = np.bincount(hour[is_sell], minlength=24)
+    hours = np.flatnonzero(buy_counts + sell_counts)
     
     fig = go.Figure()
     
-    if 'buy' in hourly_data.columns:
-        fig.add_trace(go.Scatter(x=hourly_data.index, y=hourly_data['buy'], 
+    if is_buy.any():
+        fig.add_trace(go.Scatter(x=hours, y=buy_counts[hours], 
                                 mode='lines+markers', name='Buy Trades', 
                                 line=dict(color='#ff6b6b', width=3)))
     
-    if 'sell' in hourly_data.columns:
-        fig.add_trace(go.Scatter(x=hourly_data.index, y=hourly_data['sell'], 
+    if is_sell.any():
+        fig.add_trace(go.Scatter(x=hours, y=sell_counts[hours], 
                                 mode='lines+markers', name='Sell Trades',
                                 line=dict(color='#51cf66', width=3)))
     
@@ -84,7 +106,9 @@ def create_trades_timeline(df_trades):
                      height=400)
     return fig
 
-def create_price_distribution(df_trades):
+@st.cache_data(show_spinner=False)
+def create_price_distribution(trades_key, _df_trades):
+    df_trades = _df_trades
     # Price distribution histogram
     fig = go.Figure(data=[
         go.Histogram(x=df_trades['price_eur_mwh'], nbinsx=20, 
@@ -105,6 +129,8 @@ def main():
         df_trades, asset_metrics, portfolio_metrics = load_data()
     
     st.success(f"✅ Loaded {len(df_trades)} trades successfully!")
+    trades_key = _trades_key(df_trades)
+    side_totals = _side_totals(df_trades)
     
     # Key metrics
     st.markdown("## 📊 Key Performance Metrics")
@@ -138,18 +164,18 @@ def main():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_revenue_chart(df_trades), use_container_width=True)
+        st.plotly_chart(create_revenue_chart(side_totals), use_container_width=True)
     
     with col2:
-        st.plotly_chart(create_volume_chart(df_trades), use_container_width=True)
+        st.plotly_chart(create_volume_chart(side_totals), use_container_width=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_trades_timeline(df_trades), use_container_width=True)
+        st.plotly_chart(create_trades_timeline(trades_key, df_trades), use_container_width=True)
     
     with col2:
-        st.plotly_chart(create_price_distribution(df_trades), use_container_width=True)
+        st.plotly_chart(create_price_distribution(trades_key, df_trades), use_container_width=True)
     
     # Asset performance table
     st.markdown("## 🏭 Asset Performance")
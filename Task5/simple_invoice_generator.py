@@ -1,5 +1,6 @@
+import csv
 import pandas as pd
-import json
+import orjson
 import os
 from datetime import datetime
 from typing import Dict, List
@@ -8,8 +9,8 @@ from typing import Dict, List
 VAT_RATE = 0.19  # 19% VAT rate
 BASE_PATH = "../DataEngineeringChallenge/DataEngineeringChallenge/src/"
 
-def load_asset_data() -> Dict:
-    #Load asset data including technical and contract information
+def load_asset_data() -> pd.DataFrame:
+    #Load asset data including technical and contract information, one row per asset_id
     asset_data = {}
     
     # Load technical data to get installed capacities and types
@@ -17,8 +18,8 @@ def load_asset_data() -> Dict:
     if os.path.exists(tech_data_path):
         for filename in os.listdir(tech_data_path):
             if filename.endswith('.json'):
-                with open(os.path.join(tech_data_path, filename), 'r') as f:
-                    data = json.load(f)
+                with open(os.path.join(tech_data_path, filename), 'rb') as f:
+                    data = orjson.loads(f.read())
                     for asset in data.get('assets', []):
                         asset_id = asset.get('asset_id')
                         if asset_id:
@@ -30,72 +31,69 @@ def load_asset_data() -> Dict:
                                 'price': 45.0 if asset_type == 'wind' else 50.0,  # Default prices
                                 'fee': 2.0 if asset_type == 'wind' else 2.5  # Default fees
                             }
+    assets = pd.DataFrame.from_dict(asset_data, orient='index', columns=['type', 'capacity', 'price', 'fee'])
     
     # Load contract data for pricing and fees
     contract_path = os.path.join(BASE_PATH, "vpp/contract_data")
+    contract_records = []
     if os.path.exists(contract_path):
         for file in os.listdir(contract_path):
             if file.endswith('.json'):
-                with open(os.path.join(contract_path, file)) as f:
-                    for record in json.load(f):
-                        asset_id = record.get('asset_id')
-                        if asset_id in asset_data:
-                            asset_data[asset_id].update({
-                                'price': record.get('price', asset_data[asset_id]['price']),
-                                'fee': record.get('fee', asset_data[asset_id]['fee'])
-                            })
-    
-    return asset_data
+                with open(os.path.join(contract_path, file), 'rb') as f:
+                    contract_records.extend(orjson.loads(f.read()))
+    
+    # Apply all contract overrides in one aligned update; the last price/fee
+    # given per asset wins, and assets without technical data are ignored
+    if contract_records:
+        contracts = pd.DataFrame(contract_records).reindex(columns=['asset_id', 'price', 'fee'])
+        assets.update(contracts.groupby('asset_id').last())
+    
+    return assets
 
 def load_production_data() -> pd.DataFrame:
     # Load production data from Task 2
     try:
-        df = pd.read_csv("../Task2/output/asset_best_of_infeed.csv")
-        df['delivery_start'] = pd.to_datetime(df['delivery_start'])
-        return df
+        return pd.read_parquet("../Task2/output/asset_best_of_infeed.parquet")
     except Exception as e:
         print(f"Error loading production data: {e}")
         return pd.DataFrame()
 
 def load_redispatch_data() -> pd.DataFrame:
     redispatch_path = os.path.join(BASE_PATH, "distribution_system_operator/redispatch")
-    dfs = []
+    records = []
     
+    # Collect the records of all files and build one frame, instead of a
+    # DataFrame per file followed by a concat
     if os.path.exists(redispatch_path):
         for file in os.listdir(redispatch_path):
             if file.endswith('.json'):
-                with open(os.path.join(redispatch_path, file)) as f:
-                    data = json.load(f)
-                    dfs.append(pd.DataFrame(data))
+                with open(os.path.join(redispatch_path, file), 'rb') as f:
+                    records.extend(orjson.loads(f.read()))
     
-    if dfs:
-        df = pd.concat(dfs)
+    if records:
+        df = pd.DataFrame(records)
         df['delivery_start'] = pd.to_datetime(df['delivery_start'])
         return df
     return pd.DataFrame()
 
-def calculate_invoice(asset_id: str, production_data: pd.DataFrame, 
-                     asset_data: Dict, redispatch_data: pd.DataFrame) -> Dict:
+def _to_tz(timestamps: pd.Series, tz) -> pd.Series:
+    # Express timestamps in the production data's zone so the redispatch join keys
+    # share its dtype; naive timestamps are read as local time in that zone
+    timestamps = pd.to_datetime(timestamps)
+    if tz is None:
+        return timestamps
+    if timestamps.dt.tz is None:
+        return timestamps.dt.tz_localize(tz)
+    return timestamps.dt.tz_convert(tz)
 
-    # Filter data for this asset
-    asset_prod = production_data[production_data['asset_id'] == asset_id]
-    asset_info = asset_data[asset_id]
-    
+def _build_invoice(asset_id: str, total_production_mwh: float, asset_info: Dict,
+                   redispatch_payout: float) -> Dict:
     # Calculate base payout
-    total_production_mwh = asset_prod['best_of_infeed_kw'].sum() / 1000  # Convert to MWh
     base_payout = total_production_mwh * asset_info['price']
     
     # Calculate fees
     fees = total_production_mwh * asset_info['fee']
     
-    # Calculate redispatch compensation
-    redispatch_payout = 0
-    if not redispatch_data.empty:
-        asset_redispatch = redispatch_data[redispatch_data['asset_id'] == asset_id]
-        for _, row in asset_redispatch.iterrows():
-            forecast = asset_prod[asset_prod['delivery_start'] == row['delivery_start']]['forecast_kw'].iloc[0]
-            redispatch_payout += (forecast / 1000) * row['compensation_price']
-    
     # Calculate totals with VAT
     total_net = base_payout - fees + redispatch_payout
     total_vat = total_net * VAT_RATE
@@ -119,26 +117,67 @@ def generate_all_invoices() -> List[Dict]:
     redispatch_data = load_redispatch_data()
     
     print(f"Generating invoices for {len(asset_data)} assets...")
-    invoices = []
-    for asset_id in asset_data:
+    
+    # Aggregate production and redispatch for all assets in one pass each,
+    # rather than filtering the production frame once per asset
+    try:
+        production_mwh = production_data.groupby('asset_id', observed=True)['best_of_infeed_kw'].sum() / 1000
+    except KeyError as e:
+        # Production data without the expected columns (e.g. the empty frame
+        # load_production_data returns when Task 2 has not run)
+        print(f"Error aggregating invoice data: missing column {e}")
+        return []
+    
+    redispatch_payouts = pd.Series(dtype=float)
+    # Assets that get no invoice, with the reason; a failed redispatch join only
+    # affects the assets that have redispatch records
+    failed = {}
+    if not redispatch_data.empty:
         try:
-            invoice = calculate_invoice(asset_id, production_data, asset_data, redispatch_data)
-            invoices.append(invoice)
-            print(f"Generated invoice for {asset_id}")
-        except Exception as e:
-            print(f"Error generating invoice for {asset_id}: {e}")
+            redispatch = redispatch_data[['asset_id', 'delivery_start', 'compensation_price']].assign(
+                delivery_start=lambda df: _to_tz(df['delivery_start'], production_data['delivery_start'].dt.tz))
+            joined = redispatch.merge(
+                production_data[['asset_id', 'delivery_start', 'forecast_kw']]
+                .drop_duplicates(['asset_id', 'delivery_start'])
+                .astype({'asset_id': object}),
+                on=['asset_id', 'delivery_start'], how='left'
+            )
+            redispatch_payouts = (joined['forecast_kw'] / 1000 * joined['compensation_price']).groupby(
+                joined['asset_id']).sum()
+        except (KeyError, ValueError, TypeError) as e:
+            affected = redispatch_data['asset_id'].unique() if 'asset_id' in redispatch_data else asset_data.index
+            failed = dict.fromkeys(affected, f"Could not join redispatch data: {e}")
+        else:
+            for asset_id in joined.loc[joined['forecast_kw'].isna(), 'asset_id'].unique():
+                failed[asset_id] = f"No forecast for redispatch interval of {asset_id}"
+    
+    invoices = []
+    for asset_id, asset_info in asset_data.to_dict('index').items():
+        if asset_id in failed:
+            print(f"Error generating invoice for {asset_id}: {failed[asset_id]}")
+            continue
+        redispatch_payout = float(redispatch_payouts[asset_id]) if asset_id in redispatch_payouts.index else 0
+        invoice = _build_invoice(asset_id, production_mwh.get(asset_id, 0.0), asset_info, redispatch_payout)
+        invoices.append(invoice)
+        print(f"Generated invoice for {asset_id}")
     
     return invoices
 
 def save_invoices(invoices: List[Dict]):
     os.makedirs("output", exist_ok=True)
     
-    # Save as JSON
-    with open("output/invoices.json", 'w') as f:
-        json.dump(invoices, f, indent=2)
-    
-    # Save as CSV
-    pd.DataFrame(invoices).to_csv("output/invoices.csv", index=False)
+    # Save as JSON - orjson serializes the numpy scalars directly
+    with open("output/invoices.json", 'wb') as f:
+        f.write(orjson.dumps(invoices, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    
+    # Save as CSV - written straight from the records, no DataFrame round-trip
+    with open("output/invoices.csv", 'w', newline='') as f:
+        if invoices:
+            writer = csv.DictWriter(f, fieldnames=list(invoices[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(invoices)
+        else:
+            f.write('\n')
     
     print(f"Saved {len(invoices)} invoices to output/")
 
@@ -12,6 +12,16 @@ st.set_page_config(
     layout="wide"
 )
 
+INVOICES_JSON = "output/invoices.json"
+
+@st.cache_data(show_spinner=False)
+def load_invoices(mtime):
+    # Parse the saved invoices; keyed on the file's mtime so regenerated
+    # invoices are picked up on the next rerun
+    with open(INVOICES_JSON, "r") as f:
+        invoices = json.load(f)
+    return invoices, pd.DataFrame(invoices)
+
 # Title
 st.title("💰 FlexPower Task5: Invoice Dashboard")
 st.markdown("---")
@@ -25,9 +35,7 @@ if st.button("🔄 Generate New Invoices"):
 
 # Load and display invoices
 try:
-    with open("output/invoices.json", "r") as f:
-        invoices = json.load(f)
-    df = pd.DataFrame(invoices)
+    invoices, df = load_invoices(os.path.getmtime(INVOICES_JSON))
 
     # Summary metrics
     col1, col2, col3 = st.columns(3)
@@ -41,17 +49,20 @@ try:
     # Asset breakdown
     st.subheader("📊 Asset Breakdown")
     
-    # Display as table
+    # Display as table - columns are pre-formatted once instead of rendering
+    # every cell through a Styler
+    display_formats = {
+        'production_mwh': '{:.2f}',
+        'base_payout': '{:,.2f}',
+        'fees': '{:,.2f}',
+        'redispatch_payout': '{:,.2f}',
+        'total_net': '{:,.2f}',
+        'vat': '{:,.2f}',
+        'total_gross': '{:,.2f}'
+    }
     st.dataframe(
-        df.style.format({
-            'production_mwh': '{:.2f}',
-            'base_payout': '{:,.2f}',
-            'fees': '{:,.2f}',
-            'redispatch_payout': '{:,.2f}',
-            'total_net': '{:,.2f}',
-            'vat': '{:,.2f}',
-            'total_gross': '{:,.2f}'
-        })
+        df.assign(**{col: df[col].map(fmt.format) for col, fmt in display_formats.items() if col in df}),
+        use_container_width=True
     )
 
     # Charts
@@ -15,10 +15,25 @@ st.set_page_config(
     layout="wide"
 )
 
+PERFORMANCE_FILE = "output/performance_data.parquet"
+
+# Columns the dashboard charts and KPIs use; the rest of the file is only needed
+# for the CSV export, which reads it on demand
+PERFORMANCE_COLUMNS = ['hour', 'actual_mwh', 'forecast_mwh', 'net_revenue_eur', 'imbalance_cost_eur',
+                       'asset_name', 'asset_type', 'market_price_eur_mwh']
+
+# Rows per page of the asset summary table
+ASSET_TABLE_PAGE_SIZE = 25
+
 @st.cache_data
 def load_performance_data():
     try:
-        df_performance = pd.read_csv("output/performance_data.csv")
+        df_performance = pd.read_parquet(PERFORMANCE_FILE, columns=PERFORMANCE_COLUMNS)
+        
+        # The dashboard only sums and plots the energy and money columns, so
+        # half-width floats are plenty and halve the cached frame
+        float_cols = df_performance.select_dtypes('float64').columns
+        df_performance[float_cols] = df_performance[float_cols].astype('float32')
         asset_metrics = pd.read_csv("output/asset_metrics.csv")
         
         with open("output/portfolio_metrics.json", "r") as f:
@@ -34,6 +49,35 @@ def load_performance_data():
         st.error("Please run 'task6_performance_report.py' first to generate the data.")
         return None, None, None, None
 
+@st.cache_data(show_spinner=False)
+def hourly_aggregates(mtime, _df_performance):
+    # All hour-level aggregates the charts need, from one groupby; keyed on the
+    # data file's mtime so the large frame itself is not hashed
+    return _df_performance.groupby('hour').agg(
+        forecast_mwh=('forecast_mwh', 'sum'),
+        actual_mwh=('actual_mwh', 'sum'),
+        market_price_eur_mwh=('market_price_eur_mwh', 'mean')
+    ).reset_index()
+
+@st.cache_data(show_spinner=False)
+def kpi_totals(mtime, _df_performance):
+    # Portfolio totals for the KPI row, summed once per data file
+    return _df_performance[['actual_mwh', 'net_revenue_eur', 'imbalance_cost_eur']].sum().to_dict()
+
+@st.cache_data(show_spinner=False)
+def asset_production_agg(mtime, _df_performance):
+    # Total production per asset for the production bar chart
+    return _df_performance.groupby(['asset_name', 'asset_type'], observed=True)['actual_mwh'].sum().reset_index()
+
+@st.cache_data(show_spinner=False)
+def performance_csv(mtime):
+    # The full performance table as CSV bytes, serialized once per data file
+    return pd.read_parquet(PERFORMANCE_FILE).to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
+
 def main():
     st.title("⚡ FlexPower Task 6 - Performance Dashboard")
     st.subheader("Portfolio Performance Analysis for 2025-06-08")
@@ -47,6 +91,9 @@ def main():
     # Use all data without filters
     filtered_df = df_performance
     filtered_metrics = asset_metrics
+    data_mtime = os.path.getmtime(PERFORMANCE_FILE)
+    hourly_agg = hourly_aggregates(data_mtime, filtered_df)
+    totals = kpi_totals(data_mtime, filtered_df)
     
     # Key Metrics Row
     st.header("📊 Key Performance Indicators")
@@ -54,11 +101,11 @@ def main():
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        total_production = filtered_df['actual_mwh'].sum()
+        total_production = totals['actual_mwh']
         st.metric("Total Production", f"{total_production:.1f} MWh")
     
     with col2:
-        total_revenue = filtered_df['net_revenue_eur'].sum()
+        total_revenue = totals['net_revenue_eur']
         st.metric("Net Revenue", f"€{total_revenue:,.0f}")
     
     with col3:
@@ -70,7 +117,7 @@ def main():
         st.metric("Avg Capacity Factor", f"{avg_capacity_factor:.1f}%")
     
     with col5:
-        total_imbalance = filtered_df['imbalance_cost_eur'].sum()
+        total_imbalance = totals['imbalance_cost_eur']
         st.metric("Imbalance Costs", f"€{total_imbalance:,.0f}")
     
     # Main Charts
@@ -81,10 +128,7 @@ def main():
     
     with col1:
         st.subheader("Hourly Production: Forecast vs Actual")
-        hourly_data = filtered_df.groupby('hour').agg({
-            'forecast_mwh': 'sum',
-            'actual_mwh': 'sum'
-        }).reset_index()
+        hourly_data = hourly_agg[['hour', 'forecast_mwh', 'actual_mwh']]
         
         fig_hourly = go.Figure()
         fig_hourly.add_trace(go.Scatter(
@@ -110,7 +154,7 @@ def main():
     
     with col2:
         st.subheader("Production by Asset")
-        asset_production = filtered_df.groupby(['asset_name', 'asset_type'])['actual_mwh'].sum().reset_index()
+        asset_production = asset_production_agg(data_mtime, filtered_df)
         
         fig_assets = px.bar(
             asset_production,
@@ -191,14 +235,8 @@ def main():
     st.header("📋 Asset Performance Summary")
     
     if not filtered_metrics.empty:
-        # Format the metrics for display
-        display_metrics = filtered_metrics.copy()
-        display_metrics['total_revenue_eur'] = display_metrics['total_revenue_eur'].apply(lambda x: f"€{x:,.0f}")
-        display_metrics['imbalance_cost_eur'] = display_metrics['imbalance_cost_eur'].apply(lambda x: f"€{x:,.0f}")
-        display_metrics['net_revenue_eur'] = display_metrics['net_revenue_eur'].apply(lambda x: f"€{x:,.0f}")
-        
         # Rename columns for display
-        display_metrics = display_metrics.rename(columns={
+        display_metrics = filtered_metrics.rename(columns={
             'asset_name': 'Asset Name',
             'asset_type': 'Type',
             'capacity_mw': 'Capacity (MW)',
@@ -210,86 +248,97 @@ def main():
             'net_revenue_eur': 'Net Revenue'
         })
         
+        # Only one page of assets goes to the browser; the pager appears once the
+        # portfolio outgrows a single page
+        if len(display_metrics) > ASSET_TABLE_PAGE_SIZE:
+            page_count = -(-len(display_metrics) // ASSET_TABLE_PAGE_SIZE)
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+            start = (page - 1) * ASSET_TABLE_PAGE_SIZE
+            display_metrics = display_metrics.iloc[start:start + ASSET_TABLE_PAGE_SIZE]
+        
+        # Format the money columns with a Styler so the table keeps its numeric
+        # columns (and numeric sorting) instead of shipping pre-formatted strings
+        display_table = display_metrics[[
+            'Asset Name', 'Type', 'Capacity (MW)', 'Production (MWh)',
+            'Capacity Factor (%)', 'Forecast Accuracy (%)',
+            'Total Revenue', 'Net Revenue'
+        ]].style.format({'Total Revenue': '€{:,.0f}', 'Net Revenue': '€{:,.0f}'})
+        
         st.dataframe(
-            display_metrics[[
-                'Asset Name', 'Type', 'Capacity (MW)', 'Production (MWh)',
-                'Capacity Factor (%)', 'Forecast Accuracy (%)',
-                'Total Revenue', 'Net Revenue'
-            ]],
+            display_table,
             use_container_width=True,
             hide_index=True
         )
     
     # Market Price Analysis
     st.header("💰 Market Price Analysis")
+    # Built only on request, so first paint skips these figures
+    if st.toggle("Show market price analysis", value=False):
+        col1, col2 = st.columns(2)
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Market Price Throughout the Day")
-        price_hourly = filtered_df.groupby('hour')['market_price_eur_mwh'].mean().reset_index()
+        with col1:
+            st.subheader("Market Price Throughout the Day")
+            price_hourly = hourly_agg[['hour', 'market_price_eur_mwh']]
         
-        fig_price = px.line(
-            price_hourly,
-            x='hour',
-            y='market_price_eur_mwh',
-            title="Average Market Price by Hour"
-        )
-        fig_price.update_layout(
-            xaxis_title="Hour of Day",
-            yaxis_title="Price (EUR/MWh)",
-            height=350
-        )
-        st.plotly_chart(fig_price, use_container_width=True)
+            fig_price = px.line(
+                price_hourly,
+                x='hour',
+                y='market_price_eur_mwh',
+                title="Average Market Price by Hour"
+            )
+            fig_price.update_layout(
+                xaxis_title="Hour of Day",
+                yaxis_title="Price (EUR/MWh)",
+                height=350
+            )
+            st.plotly_chart(fig_price, use_container_width=True)
     
-    with col2:
-        st.subheader("Price vs Production Correlation")
-        correlation_data = filtered_df.groupby('hour').agg({
-            'market_price_eur_mwh': 'mean',
-            'actual_mwh': 'sum'
-        }).reset_index()
+        with col2:
+            st.subheader("Price vs Production Correlation")
+            correlation_data = hourly_agg[['hour', 'market_price_eur_mwh', 'actual_mwh']]
         
-        # Fixed: Removed trendline to avoid statsmodels dependency
-        fig_correlation = px.scatter(
-            correlation_data,
-            x='actual_mwh',
-            y='market_price_eur_mwh',
-            title="Market Price vs Total Production"
-        )
-        fig_correlation.update_layout(
-            xaxis_title="Total Production (MWh)",
-            yaxis_title="Market Price (EUR/MWh)",
-            height=350
-        )
-        st.plotly_chart(fig_correlation, use_container_width=True)
+            # Fixed: Removed trendline to avoid statsmodels dependency
+            fig_correlation = px.scatter(
+                correlation_data,
+                x='actual_mwh',
+                y='market_price_eur_mwh',
+                title="Market Price vs Total Production"
+            )
+            fig_correlation.update_layout(
+                xaxis_title="Total Production (MWh)",
+                yaxis_title="Market Price (EUR/MWh)",
+                height=350
+            )
+            st.plotly_chart(fig_correlation, use_container_width=True)
     
     # Portfolio Summary
     st.header("🏢 Portfolio Summary")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Key Portfolio Metrics")
-        st.write(f"**Total Assets:** {portfolio_metrics['total_assets']}")
-        st.write(f"**Total Capacity:** {portfolio_metrics['total_capacity_mw']} MW")
-        st.write(f"**Portfolio Capacity Factor:** {portfolio_metrics['portfolio_capacity_factor_pct']}%")
-        st.write(f"**Portfolio Forecast Accuracy:** {portfolio_metrics['portfolio_accuracy_pct']}%")
-        st.write(f"**Average Market Price:** €{portfolio_metrics['avg_market_price']:.2f}/MWh")
-    
-    with col2:
-        st.subheader("Asset Mix")
-        if not filtered_metrics.empty:
-            asset_mix = filtered_metrics.groupby('asset_type')['capacity_mw'].sum().reset_index()
+    # Built only on request, so first paint skips these figures
+    if st.toggle("Show portfolio summary", value=False):
+        col1, col2 = st.columns(2)
+    
+        with col1:
+            st.subheader("Key Portfolio Metrics")
+            st.write(f"**Total Assets:** {portfolio_metrics['total_assets']}")
+            st.write(f"**Total Capacity:** {portfolio_metrics['total_capacity_mw']} MW")
+            st.write(f"**Portfolio Capacity Factor:** {portfolio_metrics['portfolio_capacity_factor_pct']}%")
+            st.write(f"**Portfolio Forecast Accuracy:** {portfolio_metrics['portfolio_accuracy_pct']}%")
+            st.write(f"**Average Market Price:** €{portfolio_metrics['avg_market_price']:.2f}/MWh")
+    
+        with col2:
+            st.subheader("Asset Mix")
+            if not filtered_metrics.empty:
+                asset_mix = filtered_metrics.groupby('asset_type')['capacity_mw'].sum().reset_index()
             
-            fig_mix = px.pie(
-                asset_mix,
-                values='capacity_mw',
-                names='asset_type',
-                title="Portfolio Mix by Capacity",
-                color_discrete_map={'Wind': 'lightblue', 'Solar': 'orange'}
-            )
-            fig_mix.update_layout(height=300)
-            st.plotly_chart(fig_mix, use_container_width=True)
+                fig_mix = px.pie(
+                    asset_mix,
+                    values='capacity_mw',
+                    names='asset_type',
+                    title="Portfolio Mix by Capacity",
+                    color_discrete_map={'Wind': 'lightblue', 'Solar': 'orange'}
+                )
+                fig_mix.update_layout(height=300)
+                st.plotly_chart(fig_mix, use_container_width=True)
     
     # Text Report Section
     st.header("📄 Detailed Performance Report")
@@ -303,33 +352,30 @@ def main():
     col1, col2, col3 = st.columns(3)
     
     with col1:
+        # The full table is large, so it is still only serialized on request
         if st.button("Download Performance Data"):
-            csv_performance = df_performance.to_csv(index=False)
             st.download_button(
                 label="Download CSV",
-                data=csv_performance,
+                data=performance_csv(data_mtime),
                 file_name="performance_data.csv",
                 mime="text/csv"
             )
     
     with col2:
-        if st.button("Download Asset Metrics"):
-            csv_metrics = asset_metrics.to_csv(index=False)
-            st.download_button(
-                label="Download CSV", 
-                data=csv_metrics,
-                file_name="asset_metrics.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="Download Asset Metrics",
+            data=to_csv_bytes(asset_metrics),
+            file_name="asset_metrics.csv",
+            mime="text/csv"
+        )
     
     with col3:
-        if st.button("Download Text Report"):
-            st.download_button(
-                label="Download TXT",
-                data=report_text,
-                file_name="performance_report.txt",
-                mime="text/plain"
-            )
+        st.download_button(
+            label="Download Text Report",
+            data=report_text,
+            file_name="performance_report.txt",
+            mime="text/plain"
+        )
     
     # Footer
     st.markdown("---")
@@ -3,15 +3,17 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 import os
-import json
+import orjson
 
 def load_forecast_data():
     # Load forecast data from Task 2's best-of-infeed output
     try:
-        # Load actual + forecast data from Task 2
-        df = pd.read_csv("../Task2/output/asset_best_of_infeed.csv")
-        df['delivery_start'] = pd.to_datetime(df['delivery_start'])
+        # Load actual + forecast data from Task 2 once, deserializing only the columns
+        # used here and by generate_actual_performance
+        df = pd.read_parquet("../Task2/output/asset_best_of_infeed.parquet",
+                             columns=['asset_id', 'delivery_start', 'forecast_kw', 'best_of_infeed_kw'])
         
         # Create asset forecasts
         df_asset = df[['asset_id', 'delivery_start', 'forecast_kw']].copy()
@@ -24,33 +26,36 @@ def load_forecast_data():
         if df_asset.empty or df_portfolio.empty:
             raise FileNotFoundError("No forecast data found")
             
-        return df_asset, df_portfolio
+        return df_asset, df_portfolio, df
         
     except Exception as e:
         print(f"Could not load forecast data: {e}")
         raise
 
+@lru_cache(maxsize=1)
 def load_asset_info():
-    # Load actual asset information from VPP data
+    # Load actual asset information from VPP data (read once per process; callers
+    # must not modify the returned dict)
     asset_info = {}
     base_path = "../DataEngineeringChallenge/DataEngineeringChallenge/src/vpp/technical_data"
     
     try:
-        for file in os.listdir(base_path):
-            if file.endswith('.json'):
-                with open(os.path.join(base_path, file)) as f:
-                    data = json.load(f)
-                    for asset in data.get('assets', []):
-                        asset_id = asset.get('asset_id')
-                        tech_attrs = asset.get('technical_attributes', {})
-                        if asset_id:
-                            asset_type = 'Wind' if 'WND' in asset_id else 'Solar'
-                            name = f"{asset_type} Farm {asset_id}"
-                            asset_info[asset_id] = {
-                                'name': name,
-                                'type': asset_type,
-                                'capacity_mw': tech_attrs.get('capacity_kw', 0) / 1000  # Convert kW to MW
-                            }
+        with os.scandir(base_path) as entries:
+            filepaths = [entry.path for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+        for filepath in filepaths:
+            with open(filepath, 'rb') as f:
+                data = orjson.loads(f.read())
+                for asset in data.get('assets', []):
+                    asset_id = asset.get('asset_id')
+                    tech_attrs = asset.get('technical_attributes', {})
+                    if asset_id:
+                        asset_type = 'Wind' if 'WND' in asset_id else 'Solar'
+                        name = f"{asset_type} Farm {asset_id}"
+                        asset_info[asset_id] = {
+                            'name': name,
+                            'type': asset_type,
+                            'capacity_mw': tech_attrs.get('capacity_kw', 0) / 1000  # Convert kW to MW
+                        }
     except Exception as e:
         print(f"[ERROR] Could not load asset info: {e}")
         raise
@@ -63,7 +68,7 @@ def get_market_prices():
     
     try:
         # Try to load trading data from Task 3
-        trading_data = pd.read_csv("../Task3/output/trading_data.csv")
+        trading_data = pd.read_parquet("../Task3/output/trading_data.parquet")
         if not trading_data.empty:
             trading_data['delivery_start'] = pd.to_datetime(trading_data['DeliveryStart'])
             prices = trading_data.groupby('delivery_start')['Price'].mean().reset_index()
@@ -75,17 +80,17 @@ def get_market_prices():
     print("[INFO] Using default market price")
     return pd.DataFrame({'price': [default_price]}), False
 
-def generate_actual_performance(df_asset):
+def generate_actual_performance(df_asset, df_full=None):
     """Generate performance data using actual data sources - OPTIMIZED"""
     # Load asset information
     asset_info = load_asset_info()
     
-    # Load actual production data from Task 2
+    # Load actual production data from Task 2, unless load_forecast_data already did
     try:
-        actual_data = pd.read_csv("../Task2/output/asset_best_of_infeed.csv")
-        actual_data['delivery_start'] = pd.to_datetime(actual_data['delivery_start'])
-        # Create a more efficient lookup using merge instead of set_index
-        actual_lookup = actual_data[['asset_id', 'delivery_start', 'best_of_infeed_kw']].copy()
+        if df_full is None:
+            df_full = pd.read_parquet("../Task2/output/asset_best_of_infeed.parquet",
+                                      columns=['asset_id', 'delivery_start', 'best_of_infeed_kw'])
+        actual_lookup = df_full[['asset_id', 'delivery_start', 'best_of_infeed_kw']]
     except FileNotFoundError as e:
         print(f"[ERROR] Could not load actual production data: {e}")
         raise
@@ -95,7 +100,9 @@ def generate_actual_performance(df_asset):
     print(f"[INFO] Using {'actual' if using_actual_prices else 'default'} market prices")
     market_price = market_prices['price'].iloc[0]
     
-    # Merge forecast data with actual data for efficient lookup
+    # Merge forecast data with actual data for efficient lookup. Task 2 repeats
+    # (asset_id, delivery_start) across forecast runs, so this join pairs every
+    # forecast row with every actual row of its interval; the metrics are built on it
     df_merged = df_asset.merge(
         actual_lookup, 
         on=['asset_id', 'delivery_start'], 
@@ -105,79 +112,98 @@ def generate_actual_performance(df_asset):
     # Fill missing actual values with 0
     df_merged['best_of_infeed_kw'] = df_merged['best_of_infeed_kw'].fillna(0)
     
-    # Vectorized calculations instead of row-by-row processing
-    df_merged['forecast_mwh'] = df_merged['value_kw'] / 1000 * 0.25
-    df_merged['actual_mwh'] = df_merged['best_of_infeed_kw'] / 1000 * 0.25
-    df_merged['revenue_eur'] = df_merged['actual_mwh'] * market_price
-    df_merged['imbalance_cost_eur'] = abs(df_merged['forecast_mwh'] - df_merged['actual_mwh']) * 50
-    df_merged['net_revenue_eur'] = df_merged['revenue_eur'] - df_merged['imbalance_cost_eur']
+    # Vectorized calculations on numpy arrays, updated in place to avoid temporaries
+    forecast_mwh = df_merged['value_kw'].to_numpy(dtype=np.float64) / 1000
+    forecast_mwh *= 0.25
+    actual_mwh = df_merged['best_of_infeed_kw'].to_numpy(dtype=np.float64) / 1000
+    actual_mwh *= 0.25
+    revenue_eur = actual_mwh * market_price
+    imbalance_cost_eur = np.subtract(forecast_mwh, actual_mwh)
+    np.abs(imbalance_cost_eur, out=imbalance_cost_eur)
+    imbalance_cost_eur *= 50
+    net_revenue_eur = revenue_eur - imbalance_cost_eur
     
     # Add asset information efficiently
     asset_info_df = pd.DataFrame.from_dict(asset_info, orient='index').reset_index()
     asset_info_df.columns = ['asset_id', 'name', 'type', 'capacity_mw']
     
+    # Share one categorical dtype for asset_id so the merge joins on its codes
+    asset_dtype = pd.CategoricalDtype(sorted(
+        set(df_merged['asset_id'].astype('category').cat.categories) | set(asset_info_df['asset_id'])
+    ))
+    df_merged['asset_id'] = df_merged['asset_id'].astype(asset_dtype)
+    asset_info_df['asset_id'] = asset_info_df['asset_id'].astype(asset_dtype)
+    
     df_final = df_merged.merge(asset_info_df, on='asset_id', how='left')
     
     # Fill missing asset info
     df_final['name'] = df_final['name'].fillna(df_final['asset_id'])
-    df_final['type'] = df_final['type'].fillna(
-        df_final['asset_id'].apply(lambda x: 'Wind' if 'WND' in str(x) else 'Solar')
-    )
+    # Derive the fallback type once per distinct asset instead of once per row
+    fallback_types = {
+        asset_id: 'Wind' if 'WND' in str(asset_id) else 'Solar'
+        for asset_id in df_final['asset_id'].unique()
+    }
+    df_final['type'] = df_final['type'].fillna(df_final['asset_id'].map(fallback_types))
     df_final['capacity_mw'] = df_final['capacity_mw'].fillna(0)
     
-    # Create final dataframe with required columns
+    # Create final dataframe with required columns (rounding the arrays in place)
     result_df = pd.DataFrame({
         'asset_id': df_final['asset_id'],
-        'asset_name': df_final['name'],
+        'asset_name': df_final['name'].astype('category'),
         'delivery_start': df_final['delivery_start'],
-        'hour': df_final['delivery_start'].dt.hour,
+        'hour': df_final['delivery_start'].dt.hour.astype(np.int8),
         'forecast_kw': df_final['value_kw'],
         'actual_kw': df_final['best_of_infeed_kw'].round(2),
-        'forecast_mwh': df_final['forecast_mwh'].round(4),
-        'actual_mwh': df_final['actual_mwh'].round(4),
+        'forecast_mwh': np.round(forecast_mwh, 4, out=forecast_mwh),
+        'actual_mwh': np.round(actual_mwh, 4, out=actual_mwh),
         'market_price_eur_mwh': round(market_price, 2),
-        'revenue_eur': df_final['revenue_eur'].round(2),
-        'imbalance_cost_eur': df_final['imbalance_cost_eur'].round(2),
-        'net_revenue_eur': df_final['net_revenue_eur'].round(2),
-        'asset_type': df_final['type'],
+        'revenue_eur': np.round(revenue_eur, 2, out=revenue_eur),
+        'imbalance_cost_eur': np.round(imbalance_cost_eur, 2, out=imbalance_cost_eur),
+        'net_revenue_eur': np.round(net_revenue_eur, 2, out=net_revenue_eur),
+        'asset_type': df_final['type'].astype('category'),
         'capacity_mw': df_final['capacity_mw']
     })
     
     return result_df
 
-def calculate_asset_metrics(df_performance):
+def calculate_asset_totals(df_performance):
+    """Sum the energy and revenue columns per asset (unrounded, shared by asset and portfolio metrics)"""
+    # Sum all numeric columns in a single groupby pass with named aggregations
+    return df_performance.groupby('asset_id', observed=True).agg(
+        capacity_mw=('capacity_mw', 'first'),
+        total_forecast_mwh=('forecast_mwh', 'sum'),
+        total_actual_mwh=('actual_mwh', 'sum'),
+        total_revenue_eur=('revenue_eur', 'sum'),
+        imbalance_cost_eur=('imbalance_cost_eur', 'sum'),
+        net_revenue_eur=('net_revenue_eur', 'sum')
+    )
+
+def calculate_asset_metrics(df_performance, totals=None):
     """Calculate key performance metrics for each asset - OPTIMIZED"""
-    # Group by asset_id and calculate all metrics at once using vectorized operations
-    grouped = df_performance.groupby('asset_id').agg({
-        'asset_name': 'first',
-        'asset_type': 'first',
-        'capacity_mw': 'first',
-        'forecast_mwh': 'sum',
-        'actual_mwh': 'sum',
-        'revenue_eur': 'sum',
-        'imbalance_cost_eur': 'sum',
-        'net_revenue_eur': 'sum'
-    }).reset_index()
-    
-    # Vectorized calculations for performance indicators
-    grouped['forecast_accuracy_pct'] = np.where(
-        grouped['forecast_mwh'] > 0,
-        (1 - abs(grouped['forecast_mwh'] - grouped['actual_mwh']) / grouped['forecast_mwh']) * 100,
-        0
-    ).round(1)
-    
-    grouped['capacity_factor_pct'] = np.where(
-        grouped['capacity_mw'] > 0,
-        (grouped['actual_mwh'] / (grouped['capacity_mw'] * 24)) * 100,
-        0
-    ).round(1)
-    
-    # Rename columns to match expected output
-    grouped.rename(columns={
-        'forecast_mwh': 'total_forecast_mwh',
-        'actual_mwh': 'total_actual_mwh',
-        'revenue_eur': 'total_revenue_eur'
-    }, inplace=True)
+    if totals is None:
+        totals = calculate_asset_totals(df_performance)
+    
+    # Name and type are constant per asset, so take them from each asset's first
+    # row instead of running a string 'first' aggregation over every row
+    asset_attrs = df_performance.loc[
+        ~df_performance['asset_id'].duplicated(), ['asset_id', 'asset_name', 'asset_type']
+    ]
+    grouped = asset_attrs.merge(totals, left_on='asset_id', right_index=True)
+    grouped = grouped.sort_values('asset_id').reset_index(drop=True)
+    
+    # Vectorized calculations for performance indicators; the divides only run
+    # where the denominator is positive, the rest keep the 0% fallback
+    forecast = grouped['total_forecast_mwh'].to_numpy(dtype=np.float64)
+    actual = grouped['total_actual_mwh'].to_numpy(dtype=np.float64)
+    capacity_mwh = grouped['capacity_mw'].to_numpy(dtype=np.float64) * 24
+    
+    error_ratio = np.divide(np.abs(forecast - actual), forecast,
+                            out=np.ones_like(forecast), where=forecast > 0)
+    grouped['forecast_accuracy_pct'] = np.round((1 - error_ratio) * 100, 1)
+    
+    capacity_factor = np.divide(actual, capacity_mwh,
+                                out=np.zeros_like(actual), where=capacity_mwh > 0)
+    grouped['capacity_factor_pct'] = np.round(capacity_factor * 100, 1)
     
     # Round numeric columns
     numeric_cols = ['total_forecast_mwh', 'total_actual_mwh', 'total_revenue_eur', 
@@ -186,27 +212,31 @@ def calculate_asset_metrics(df_performance):
     
     return grouped
 
-def calculate_portfolio_metrics(df_performance):
+def calculate_portfolio_metrics(df_performance, totals=None):
     """Calculate portfolio-level performance metrics - HEAVILY OPTIMIZED"""
-    # Use vectorized operations for all calculations
-    total_forecast = df_performance['forecast_mwh'].sum()
-    total_actual = df_performance['actual_mwh'].sum()
-    total_revenue = df_performance['revenue_eur'].sum()
-    total_imbalance = df_performance['imbalance_cost_eur'].sum()
-    net_revenue = df_performance['net_revenue_eur'].sum()
+    # Add up the per-asset totals instead of re-scanning every performance row
+    if totals is None:
+        totals = calculate_asset_totals(df_performance)
+    # One column-wise reduction over all the totals
+    sums = totals.sum()
+    total_forecast = sums['total_forecast_mwh']
+    total_actual = sums['total_actual_mwh']
+    total_revenue = sums['total_revenue_eur']
+    total_imbalance = sums['imbalance_cost_eur']
+    net_revenue = sums['net_revenue_eur']
     
     # Portfolio performance
     portfolio_accuracy = (1 - abs(total_forecast - total_actual) / total_forecast) * 100 if total_forecast > 0 else 0
     
-    # More efficient capacity calculation - avoid groupby on large dataset
-    total_capacity = df_performance.drop_duplicates('asset_id')['capacity_mw'].sum()
+    # Capacity is constant per asset, so the per-asset values add up to the portfolio
+    total_capacity = sums['capacity_mw']
     portfolio_capacity_factor = (total_actual / (total_capacity * 24)) * 100 if total_capacity > 0 else 0
     
-    # Count unique assets efficiently
-    total_assets = df_performance['asset_id'].nunique()
+    # One row of totals per asset
+    total_assets = len(totals)
     
     # Average market price (should be constant anyway)
-    avg_market_price = df_performance['market_price_eur_mwh'].iloc[0]  # More efficient than mean()
+    avg_market_price = df_performance['market_price_eur_mwh'].iat[0]  # More efficient than mean()
     
     return {
         'total_assets': total_assets,
@@ -221,10 +251,23 @@ def calculate_portfolio_metrics(df_performance):
         'avg_market_price': round(avg_market_price, 2)
     }
 
+# One asset's section of the text report, filled from an asset_metrics row
+ASSET_REPORT_TEMPLATE = (
+    "\n"
+    "\n{asset_name} ({asset_id})\n"
+    "  Type: {asset_type} | Capacity: {capacity_mw} MW\n"
+    "  Production: {total_actual_mwh} MWh\n"
+    "  Capacity Factor: {capacity_factor_pct}%\n"
+    "  Forecast Accuracy: {forecast_accuracy_pct}%\n"
+    "  Revenue: €{total_revenue_eur:,.2f}\n"
+    "  Imbalance Cost: €{imbalance_cost_eur:,.2f}\n"
+    "  Net Revenue: €{net_revenue_eur:,.2f}"
+)
+
 def create_performance_report(asset_metrics, portfolio_metrics):
     """Generate text-based performance report - OPTIMIZED"""
     # Use list comprehension and join for better performance
-    lines = [
+    header = [
         "=" * 80,
         "FLEXPOWER PORTFOLIO PERFORMANCE REPORT",
         "=" * 80,
@@ -250,76 +293,68 @@ def create_performance_report(asset_metrics, portfolio_metrics):
         "-" * 80
     ]
     
-    # More efficient asset processing
-    for _, asset in asset_metrics.iterrows():
-        lines.extend([
-            f"\n{asset['asset_name']} ({asset['asset_id']})",
-            f"  Type: {asset['asset_type']} | Capacity: {asset['capacity_mw']} MW",
-            f"  Production: {asset['total_actual_mwh']} MWh",
-            f"  Capacity Factor: {asset['capacity_factor_pct']}%",
-            f"  Forecast Accuracy: {asset['forecast_accuracy_pct']}%",
-            f"  Revenue: €{asset['total_revenue_eur']:,.2f}",
-            f"  Imbalance Cost: €{asset['imbalance_cost_eur']:,.2f}",
-            f"  Net Revenue: €{asset['net_revenue_eur']:,.2f}"
-        ])
-    
-    lines.extend(["", "=" * 80])
-    
-    return "\n".join(lines)
+    # itertuples reads each row as a plain tuple instead of boxing it into a Series;
+    # each asset's section is rendered from the template in one format call
+    asset_sections = "".join(
+        ASSET_REPORT_TEMPLATE.format_map(asset._asdict())
+        for asset in asset_metrics.itertuples(index=False)
+    )
+    
+    return "\n".join(header) + asset_sections + "\n\n" + "=" * 80
+
+def _write_atomically(path, write):
+    """Write a file through write(tmp_path), then move it into place in one step"""
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def _write_file(path, data, mode="w"):
+    with open(path, mode) as f:
+        f.write(data)
 
 def save_results(df_performance, asset_metrics, portfolio_metrics, report_text):
     """Save all results to files"""
-    # Clean up old files
+    # Each output replaces its previous version atomically, so a failed run never
+    # leaves a half-written file behind and nothing needs clearing up front
     output_dir = "output"
-    if os.path.exists(output_dir):
-        for file in os.listdir(output_dir):
-            file_path = os.path.join(output_dir, file)
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                print(f"Error: {e}")
-    else:
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
     
     # Save performance data
-    df_performance.to_csv("output/performance_data.csv", index=False)
-    print("[INFO] Saved performance_data.csv")
+    _write_atomically("output/performance_data.parquet", lambda tmp: df_performance.to_parquet(
+        tmp, engine='pyarrow', compression='snappy', index=False))
+    print("[INFO] Saved performance_data.parquet")
     
     # Save asset metrics
-    asset_metrics.to_csv("output/asset_metrics.csv", index=False)
+    _write_atomically("output/asset_metrics.csv", lambda tmp: asset_metrics.to_csv(tmp, index=False))
     print("[INFO] Saved asset_metrics.csv")
     
-    # Save portfolio metrics as JSON
-    with open("output/portfolio_metrics.json", "w") as f:
-        # Convert numpy types to native Python types
-        portfolio_metrics_json = {k: float(v) if isinstance(v, (np.float64, np.float32, np.int64, np.int32)) else v 
-                                for k, v in portfolio_metrics.items()}
-        json.dump(portfolio_metrics_json, f, indent=2)
+    # Save portfolio metrics as JSON; orjson serializes the numpy scalars directly
+    metrics_json = orjson.dumps(portfolio_metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    _write_atomically("output/portfolio_metrics.json", lambda tmp: _write_file(tmp, metrics_json, "wb"))
     print("[INFO] Saved portfolio_metrics.json")
     
     # Save report
-    with open("output/performance_report.txt", "w") as f:
-        f.write(report_text)
+    _write_atomically("output/performance_report.txt", lambda tmp: _write_file(tmp, report_text))
     print("[INFO] Saved performance_report.txt")
 
 def main():
     
     # Step 1: Load forecast data from Task 1
     print("1. Loading forecast data from Task 1...")
-    df_asset_forecast, df_portfolio_forecast = load_forecast_data()
+    df_asset_forecast, df_portfolio_forecast, df_best_of_infeed = load_forecast_data()
     
     # Step 2: Generate actual performance data
     print("2. Generating actual performance data...")
-    df_performance = generate_actual_performance(df_asset_forecast)
+    df_performance = generate_actual_performance(df_asset_forecast, df_best_of_infeed)
     
     # Step 3: Calculate asset metrics
     print("3. Calculating asset performance metrics...")
-    asset_metrics = calculate_asset_metrics(df_performance)
+    asset_totals = calculate_asset_totals(df_performance)
+    asset_metrics = calculate_asset_metrics(df_performance, asset_totals)
     
     # Step 4: Calculate portfolio metrics
     print("4. Calculating portfolio metrics...")
-    portfolio_metrics = calculate_portfolio_metrics(df_performance)
+    portfolio_metrics = calculate_portfolio_metrics(df_performance, asset_totals)
     
     # Step 5: Generate performance report
     print("5. Generating performance report...")
@@ -0,0 +1,15 @@
+# Helpers shared by the tasks that read the VPP JSON files
+
+import ijson
+
+def iter_record_keys(f):
+    """Yield the 'key' object of each record in an open (binary) JSON file"""
+    # Stream the file so the large 'values' arrays are never built; the files hold
+    # either a list of records or a single record, and for a single record the
+    # parse stops as soon as its 'key' object is complete
+    is_list = f.read(64).lstrip().startswith(b'[')
+    f.seek(0)
+    if is_list:
+        yield from ijson.items(f, 'item.key')
+    else:
+        yield next(ijson.items(f, 'key'), {})
@@ -19,7 +19,13 @@ def run_streamlit_apps():
     print("\n=== Starting FlexPower Streamlit Dashboards ===")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
+    # Each dashboard's output goes to its own log file; an undrained pipe would
+    # stall the app once its logs filled the pipe buffer
+    log_dir = os.path.join(current_dir, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    
     processes = []
+    log_files = []
     for app in streamlit_apps:
         app_path = os.path.join(current_dir, app["path"])
         app_dir = os.path.dirname(app_path)
@@ -32,14 +38,17 @@ def run_streamlit_apps():
         try:
             # Run the Streamlit app on specified port
             cmd = ['streamlit', 'run', app_path, '--server.port', str(app["port"])]
+            log_path = os.path.join(log_dir, f"streamlit_{app['port']}.log")
+            log_file = open(log_path, "wb")
+            log_files.append(log_file)
             process = subprocess.Popen(
                 cmd,
                 cwd=app_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stdout=log_file,
+                stderr=subprocess.STDOUT
             )
             processes.append(process)
-            print(f"✓ Started {app['path']} on http://localhost:{app['port']}")
+            print(f"✓ Started {app['path']} on http://localhost:{app['port']} (log: logs/{os.path.basename(log_path)})")
         except Exception as e:
             print(f"✗ Error starting {app['path']}: {e}")
     
@@ -60,7 +69,12 @@ def run_streamlit_apps():
         print("\nStopping all dashboards...")
         for process in processes:
             process.terminate()
+        for process in processes:
+            process.wait()
         print("All dashboards stopped")
+    finally:
+        for log_file in log_files:
+            log_file.close()
 
 if __name__ == "__main__":
     run_streamlit_apps()
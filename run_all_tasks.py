@@ -1,45 +1,85 @@
+import asyncio
 import os
-import subprocess
+import time
 from datetime import datetime
 
-def run_tasks():
-    """Run all FlexPower tasks in sequence"""
+# Tasks grouped into stages. Each task only reads the outputs of earlier stages
+# (Task2 needs Task1's forecasts; Task5 and Task6 need Task2, and Task6 also
+# needs Task3), so the tasks within one stage can run side by side
+TASK_STAGES = [
+    ["Task1/Forecasting.py", "Task3/Trading.py"],
+    ["Task2/best_of_infeed.py"],
+    ["Task5/simple_invoice_generator.py",  # Using the simplified version
+     "Task6/task6_performance_report.py"]
+]
+
+async def run_task(task, task_path, slots):
+    """Run one task in its own directory and report it once it finishes"""
+    async with slots:
+        # Timed once the task holds a slot, so waiting for a free core is not counted
+        start = time.monotonic()
+        process = await asyncio.create_subprocess_exec(
+            'python', task_path,
+            cwd=os.path.dirname(task_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        output, _ = await process.communicate()
+        elapsed = time.monotonic() - start
+
+    # Print the task's output in one block so tasks running side by side do not
+    # interleave their logs
+    print(f"\n--- {task} ---")
+    print(output.decode(errors='replace'), end="")
+    if process.returncode == 0:
+        print(f"✓ Completed {task} in {elapsed:.1f}s")
+    else:
+        print(f"✗ Error running {task}: exited with status {process.returncode} after {elapsed:.1f}s")
+
+def find_missing_tasks(current_dir):
+    """Return the task scripts that do not exist, listing each task folder once"""
+    all_tasks = [task for stage in TASK_STAGES for task in stage]
+    present = {}
+    for task_dir in {os.path.dirname(task) for task in all_tasks}:
+        try:
+            present[task_dir] = set(os.listdir(os.path.join(current_dir, task_dir)))
+        except FileNotFoundError:
+            present[task_dir] = set()
+    return [task for task in all_tasks
+            if os.path.basename(task) not in present[os.path.dirname(task)]]
+
+async def run_tasks():
+    """Run all FlexPower tasks, stage by stage"""
     # Get current directory
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # List of tasks to run in order
-    tasks = [
-        "Task1/Forecasting.py",
-        "Task2/best_of_infeed.py",
-        "Task3/Trading.py",
-        "Task5/simple_invoice_generator.py",  # Using the simplified version
-        "Task6/task6_performance_report.py"
-    ]
-    
+
     print("\n=== Starting FlexPower Tasks ===")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    
-    for task in tasks:
-        task_path = os.path.join(current_dir, task)
-        task_dir = os.path.dirname(task_path)
-        
-        if not os.path.exists(task_path):
-            print(f"[ERROR] Task not found: {task}")
-            continue
-            
-        print(f"\nRunning {task}...")
-        try:
-            # Run the task in its directory
-            process = subprocess.run(
-                ['python', task_path],
-                cwd=task_dir,
-                check=True
-            )
-            print(f"✓ Completed {task}")
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Error running {task}: {e}")
-            
+
+    # Check every task up front so missing scripts are reported before any runs
+    missing = find_missing_tasks(current_dir)
+    for task in missing:
+        print(f"[ERROR] Task not found: {task}")
+
+    # At most one task per core at a time; the tasks are CPU-bound
+    slots = asyncio.Semaphore(os.cpu_count() or 1)
+    for stage in TASK_STAGES:
+        tasks, runs = [], []
+        for task in stage:
+            if task in missing:
+                continue
+            task_path = os.path.join(current_dir, task)
+
+            print(f"\nRunning {task}...")
+            tasks.append(task)
+            runs.append(run_task(task, task_path, slots))
+
+        results = await asyncio.gather(*runs, return_exceptions=True)
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                print(f"✗ Error running {task}: {result}")
+
     print("\n=== All tasks processed ===")
 
 if __name__ == "__main__":
-    run_tasks()
+    asyncio.run(run_tasks())
@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+# Project root, resolved once; the tests read task outputs relative to it so
+# they do not depend on the directory pytest is started from
+ROOT = Path(__file__).resolve().parent.parent
+
+# Task directories that produce outputs
+TASK_DIRS = ['Task1', 'Task2', 'Task3', 'Task5', 'Task6']
+
+# Add project root to Python path
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
@@ -0,0 +1,39 @@
+import pytest
+
+from _paths import ROOT, TASK_DIRS
+
+# Columns the tests look at in each task output; the rest of a file is not parsed
+TESTED_COLUMNS = {
+    "Task1/output/asset_forecasts.csv": {'delivery_start', 'asset_id', 'value_kw'},
+    "Task3/output/trading_metrics.csv": {'execution_time', 'price', 'volume'},
+}
+
+@pytest.fixture(scope="session", autouse=True)
+def _ensure_output_dirs():
+    """Create any missing task output directories once per test session"""
+    for task_dir in TASK_DIRS:
+        # A missing task directory is left for test_task_directories_exist to report
+        if (ROOT / task_dir).is_dir():
+            (ROOT / task_dir / 'output').mkdir(exist_ok=True)
+
+@pytest.fixture(scope="session")
+def data_cache():
+    """Read each task output CSV (path relative to the project root) once per test
+    session; None if it is missing"""
+    cache = {}
+
+    def get(path):
+        if path not in cache:
+            # pandas is imported on first use, so runs without CSV tests skip it
+            import pandas as pd
+            columns = TESTED_COLUMNS.get(path)
+            # A callable usecols skips the other columns without failing on missing
+            # ones, so the tests still report those themselves
+            usecols = (lambda col: col in columns) if columns else None
+            try:
+                cache[path] = pd.read_csv(ROOT / path, usecols=usecols)
+            except FileNotFoundError:
+                cache[path] = None
+        return cache[path]
+
+    return get
@@ -1,55 +1,64 @@
-import sys
 import os
 import pytest
-import pandas as pd
 from datetime import datetime
 
-# Add project root to Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _paths import ROOT, TASK_DIRS
+
+def _all_numeric(column):
+    """True when every value in the column is a number"""
+    import numpy as np
+    import pandas as pd
+    # Columns pandas already parsed as numbers only need a NaN scan
+    if pd.api.types.is_numeric_dtype(column):
+        return not np.isnan(column.to_numpy(dtype=np.float64)).any()
+    return pd.to_numeric(column, errors='coerce').notnull().all()
 
 class TestFileStructure:
     def test_task_directories_exist(self):
         """Test that all task directories exist"""
-        task_dirs = ['Task1', 'Task2', 'Task3', 'Task5', 'Task6']
-        for dir_name in task_dirs:
-            assert os.path.exists(dir_name), f"Task directory {dir_name} not found"
+        # One listing of the project root instead of a stat per directory
+        with os.scandir(ROOT) as entries:
+            root_dirs = {entry.name for entry in entries if entry.is_dir()}
+        for dir_name in TASK_DIRS:
+            assert dir_name in root_dirs, f"Task directory {dir_name} not found"
     
     def test_output_directories_exist(self):
         """Test that output directories exist in each task"""
-        task_dirs = ['Task1', 'Task2', 'Task3', 'Task5', 'Task6']
-        for dir_name in task_dirs:
-            output_dir = os.path.join(dir_name, 'output')
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+        # The session fixture in conftest.py creates any that are missing
+        for dir_name in TASK_DIRS:
+            output_dir = ROOT / dir_name / 'output'
+            assert output_dir.is_dir(), f"Output directory {output_dir} not found"
 
 class TestDataFormats:
-    def test_date_formats(self):
+    def test_date_formats(self, data_cache):
         """Test date formats in various files"""
+        # Imported here so collecting the file-structure tests does not load pandas
+        import pandas as pd
+        forecasts = data_cache("Task1/output/asset_forecasts.csv")
+        trades = data_cache("Task3/output/trading_metrics.csv")
+        if forecasts is None or trades is None:
+            pytest.skip("Data files not generated yet")
         try:
             # Test forecast dates
-            forecasts = pd.read_csv("Task1/output/asset_forecasts.csv")
             pd.to_datetime(forecasts['delivery_start'])
             
             # Test trading dates
-            trades = pd.read_csv("Task3/output/trading_metrics.csv")
             pd.to_datetime(trades['execution_time'])
-        except FileNotFoundError:
-            pytest.skip("Data files not generated yet")
         except KeyError:
             pytest.fail("Required date columns not found")
     
-    def test_numeric_formats(self):
+    def test_numeric_formats(self, data_cache):
         """Test numeric data formats"""
+        forecasts = data_cache("Task1/output/asset_forecasts.csv")
+        trades = data_cache("Task3/output/trading_metrics.csv")
+        if forecasts is None or trades is None:
+            pytest.skip("Data files not generated yet")
         try:
             # Test forecast values
-            forecasts = pd.read_csv("Task1/output/asset_forecasts.csv")
-            assert pd.to_numeric(forecasts['value_kw'], errors='coerce').notnull().all()
+            assert _all_numeric(forecasts['value_kw'])
             
             # Test trading values
-            trades = pd.read_csv("Task3/output/trading_metrics.csv")
-            assert pd.to_numeric(trades['price'], errors='coerce').notnull().all()
-            assert pd.to_numeric(trades['volume'], errors='coerce').notnull().all()
-        except FileNotFoundError:
-            pytest.skip("Data files not generated yet")
+            assert _all_numeric(trades['price'])
+            assert _all_numeric(trades['volume'])
         except KeyError:
             pytest.fail("Required numeric columns not found")
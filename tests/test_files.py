@@ -1,9 +1,20 @@
 import os
-import sys
+from functools import lru_cache
 import pytest
 
-# Add project root to Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _paths import ROOT
+
+@lru_cache(maxsize=None)
+def _dir_entries(parent):
+    """Names in a directory, listed with one scandir pass per directory"""
+    with os.scandir(parent) as entries:
+        return frozenset(entry.name for entry in entries)
+
+def _exists(path):
+    parent, name = os.path.split(ROOT / path)
+    if not os.path.isdir(parent):
+        return os.path.exists(ROOT / path)
+    return name in _dir_entries(parent)
 
 def test_streamlit_files():
     """Test that all Streamlit dashboard files exist"""
@@ -16,7 +27,7 @@ def test_streamlit_files():
     ]
     
     for file_path in streamlit_files:
-        assert os.path.exists(file_path), f"Streamlit file {file_path} not found"
+        assert _exists(file_path), f"Streamlit file {file_path} not found"
 
 def test_main_task_files():
     """Test that main task files exist"""
@@ -29,7 +40,7 @@ def test_main_task_files():
     ]
     
     for file_path in task_files:
-        assert os.path.exists(file_path), f"Task file {file_path} not found"
+        assert _exists(file_path), f"Task file {file_path} not found"
 
 def test_runner_files():
     """Test that task runner files exist"""
@@ -41,4 +52,4 @@ def test_runner_files():
     ]
     
     for file_path in runner_files:
-        assert os.path.exists(file_path), f"Runner file {file_path} not found"
+        assert _exists(file_path), f"Runner file {file_path} not found"
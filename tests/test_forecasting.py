@@ -0,0 +1,22 @@
+import pandas as pd
+
+import _paths  # noqa: F401 - puts the project root on sys.path
+
+from Task1 import Forecasting
+
+def test_write_csv_layout(tmp_path):
+    """Forecast CSVs keep whole-second timestamps and quote their strings"""
+    df = pd.DataFrame({
+        'delivery_start': pd.to_datetime(['2025-07-08 00:00:00', '2025-07-08 00:15:00.250'], format='ISO8601'),
+        'asset_id': ['WND-DE-001', 'WND "North", DE'],
+        'value_kw': [1250.5, 0.75],
+    })
+    path = tmp_path / "asset_forecasts.csv"
+    Forecasting._write_csv(df, path)
+
+    assert path.read_text() == (
+        '"delivery_start","asset_id","value_kw"\n'
+        '"2025-07-08 00:00:00","WND-DE-001",1250.5\n'
+        '"2025-07-08 00:15:00","WND ""North"", DE",0.75\n'
+    )
+    assert pd.read_csv(path)['asset_id'].tolist() == df['asset_id'].tolist()
@@ -0,0 +1,45 @@
+import pandas as pd
+
+import _paths  # noqa: F401 - puts the project root on sys.path
+
+from Task5 import simple_invoice_generator
+
+def _patch_loaders(monkeypatch, redispatch):
+    assets = pd.DataFrame({'type': ['wind', 'solar'], 'capacity': [1000, 500],
+                           'price': [45.0, 50.0], 'fee': [2.0, 2.5]},
+                          index=['WND-DE-001', 'PV-DE-001'])
+    delivery_start = pd.date_range('2025-07-08', periods=2, freq='15min', tz='Europe/Berlin')
+    production = pd.DataFrame({
+        'asset_id': pd.Categorical(['WND-DE-001', 'WND-DE-001', 'PV-DE-001', 'PV-DE-001']),
+        'delivery_start': delivery_start.append(delivery_start),
+        'best_of_infeed_kw': [1000.0, 2000.0, 400.0, 600.0],
+        'forecast_kw': [1200.0, 1800.0, 500.0, 500.0],
+    })
+    monkeypatch.setattr(simple_invoice_generator, 'load_asset_data', lambda: assets)
+    monkeypatch.setattr(simple_invoice_generator, 'load_production_data', lambda: production)
+    monkeypatch.setattr(simple_invoice_generator, 'load_redispatch_data', lambda: redispatch)
+
+def test_naive_redispatch_timestamps_join_in_production_tz(monkeypatch):
+    """Redispatch records without an offset are read as Europe/Berlin local time"""
+    _patch_loaders(monkeypatch, pd.DataFrame({
+        'asset_id': ['WND-DE-001'],
+        'delivery_start': pd.to_datetime(['2025-07-08 00:15:00']),
+        'compensation_price': [100.0],
+    }))
+    invoices = {invoice['asset_id']: invoice for invoice in simple_invoice_generator.generate_all_invoices()}
+
+    assert set(invoices) == {'WND-DE-001', 'PV-DE-001'}
+    # 1800 kW forecast at 100 EUR/MWh
+    assert invoices['WND-DE-001']['redispatch_payout'] == 180.0
+    assert invoices['PV-DE-001']['redispatch_payout'] == 0
+
+def test_failed_redispatch_join_only_skips_affected_assets(monkeypatch):
+    """A redispatch record that cannot be joined costs only its own asset's invoice"""
+    _patch_loaders(monkeypatch, pd.DataFrame({
+        'asset_id': ['WND-DE-001'],
+        'delivery_start': ['not a timestamp'],
+        'compensation_price': [100.0],
+    }))
+    invoices = simple_invoice_generator.generate_all_invoices()
+
+    assert [invoice['asset_id'] for invoice in invoices] == ['PV-DE-001']
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import _paths  # noqa: F401 - puts the project root on sys.path
+
+# The numba kernels are optional and only used on inputs far larger than the
+# sample data, so these tests force them on small random inputs
+pytest.importorskip("numba")
+
+from Task2 import best_of_infeed
+from Task3 import Trading
+
+def _not_called(*args):
+    raise AssertionError("numpy fallback used instead of the numba kernel")
+
+def test_group_sum_count_numba_matches_sorted(monkeypatch):
+    """The dense numba aggregation agrees with the sort + reduceat path"""
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 50, size=10_000)
+    values = rng.random(10_000)
+    expected_keys, expected_sums, expected_counts = best_of_infeed._group_sum_count_sorted(keys, values)
+
+    monkeypatch.setattr(best_of_infeed, 'NUMBA_MIN_ROWS', 0)
+    monkeypatch.setattr(best_of_infeed, '_group_sum_count_sorted', _not_called)
+    # Keys 50..59 never occur, so the empty groups must be dropped as well
+    group_keys, sums, counts = best_of_infeed._group_sum_count(keys, values, 60)
+
+    np.testing.assert_array_equal(group_keys, expected_keys)
+    np.testing.assert_allclose(sums, expected_sums)
+    np.testing.assert_array_equal(counts, expected_counts)
+
+def test_signed_values_fused_matches_numpy(monkeypatch):
+    """The fused numba revenue/signed-volume pass agrees with the numpy passes"""
+    rng = np.random.default_rng(0)
+    price = rng.uniform(-50, 200, size=10_000)
+    volume = rng.uniform(0, 10, size=10_000)
+    sign = rng.choice([-1.0, 1.0], size=10_000)
+    expected_revenue, expected_signed_volume = Trading._signed_values_numpy(price, volume, sign)
+
+    monkeypatch.setattr(Trading, 'NUMBA_MIN_ROWS', 0)
+    monkeypatch.setattr(Trading, '_signed_values_numpy', _not_called)
+    revenue, signed_volume = Trading._signed_values(price, volume, sign)
+
+    np.testing.assert_allclose(revenue, expected_revenue)
+    np.testing.assert_allclose(signed_volume, expected_signed_volume)